@@ -1,10 +1,13 @@
+import os
 import pandas as pd
-from itertools import combinations
-import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
+from time import perf_counter
 import matplotlib.pyplot as plt
 
 CSV_FILE = "../datasets/actions_list.csv"
 BUDGET = 500
+SEARCH_MODE = "meet_in_the_middle"  # "exhaustive" (référence), "parallel" ou "meet_in_the_middle"
 
 
 def load_dataset(csv_file):
@@ -32,18 +35,67 @@ def clean_dataset(dataframe):
     return dataframe
 
 
-def calculate_profit_combinations(combination):
+class ActionSet:
+    """
+    Ensemble d'actions stocké en colonnes parallèles : noms, coûts en euros, bénéfices en décimales
+    et montants des bénéfices. Les recherches travaillent sur les indices des actions.
+    """
+    __slots__ = ('names', 'costs', 'profit', 'profit_amount')
+
+    def __init__(self, names, costs, profit, profit_amount):
+        self.names = list(names)
+        self.costs = list(costs)
+        self.profit = list(profit)
+        self.profit_amount = list(profit_amount)
+
+    def __len__(self):
+        return len(self.costs)
+
+    def __getitem__(self, indices):
+        """
+        Sous-ensemble des actions (par exemple actions[:10]).
+        :param indices: tranche
+        :return actions:
+        """
+        return ActionSet(self.names[indices], self.costs[indices],
+                         self.profit[indices], self.profit_amount[indices])
+
+    @classmethod
+    def from_dataframe(cls, dataframe):
+        """
+        Construire l'ensemble d'actions à partir des données nettoyées
+        :param dataframe:
+        :return actions:
+        """
+        return cls(dataframe['Actions #'], dataframe['cost'], dataframe['profit'], dataframe['profit_amount'])
+
+    def records(self, combination):
+        """
+        Actions d'une combinaison sous forme de dictionnaires, pour l'affichage
+        :param combination: indices des actions
+        :return records:
+        """
+        return [{'Actions #': self.names[index], 'cost': self.costs[index],
+                 'profit': self.profit[index], 'profit_amount': self.profit_amount[index]}
+                for index in combination]
+
+
+def calculate_profit_combinations(actions, combination):
     """
     Calculer le profit généré par chaque combinaison
-    :param combination:
+    :param actions:
+    :param combination: indices des actions
     :return total_cost:
     :return total_profit:
     """
+    costs = actions.costs
+    profits = actions.profit_amount
+
     # Calcule le coût total de toutes les actions d'une combinaison
-    total_cost = sum(action['cost'] for action in combination)
+    total_cost = sum(costs[index] for index in combination)
 
     # Calcule le profit total de la combinaison
-    total_profit = sum(action['profit_amount'] for action in combination)
+    total_profit = sum(profits[index] for index in combination)
     return total_cost, total_profit
 
 
@@ -55,16 +107,17 @@ def find_best_combination(actions, budget=BUDGET):
     :return:
     """
     best_profit = 0
-    best_combination = []
+    best_combination = ()
+    best_combination_cost = 0
     total_combinations = 0
 
     # r va tester les combinaisons de 1 à n actions
     # Combinations de itertools est un outil qui permet de créer tous les groupes possibles d’éléments dans une liste,
     # sans répéter les éléments dans un ordre différent.
     for r in range(1, len(actions) + 1):
-        for combination in combinations(actions, r):
+        for combination in combinations(range(len(actions)), r):
             total_combinations += 1
-            total_cost, total_profit = calculate_profit_combinations(combination)
+            total_cost, total_profit = calculate_profit_combinations(actions, combination)
 
             # Vérifier si le coût total est inférieur ou égal au budget
             if total_cost <= budget and total_profit > best_profit:
@@ -75,6 +128,156 @@ def find_best_combination(actions, budget=BUDGET):
     return best_combination, best_profit, best_combination_cost, total_combinations
 
 
+def gray_code_search(costs, profits, budget, start, stop):
+    """
+    Parcourir les sous-ensembles de rang start à stop - 1 dans l'ordre du code de Gray.
+    Deux sous-ensembles consécutifs ne diffèrent que d'une action : le coût et le profit
+    courants sont mis à jour en O(1) au lieu d'être recalculés.
+    :param costs: coûts entiers en centimes
+    :param profits:
+    :param budget: budget en centimes
+    :param start:
+    :param stop:
+    :return best_profit:
+    :return best_mask: masque des actions de la meilleure combinaison de la plage
+    """
+    # Sous-ensemble de départ : code de Gray du rang start
+    mask = start ^ (start >> 1)
+    total_cost = sum(cost for index, cost in enumerate(costs) if mask >> index & 1)
+    total_profit = sum(profit for index, profit in enumerate(profits) if mask >> index & 1)
+
+    best_profit = 0
+    best_mask = 0
+    if total_cost <= budget and total_profit > best_profit:
+        best_profit = total_profit
+        best_mask = mask
+
+    for rank in range(start + 1, stop):
+        # L'action qui change est celle du bit de poids faible du rang
+        index = (rank & -rank).bit_length() - 1
+        mask ^= 1 << index
+        if mask >> index & 1:
+            total_cost += costs[index]
+            total_profit += profits[index]
+        else:
+            total_cost -= costs[index]
+            total_profit -= profits[index]
+
+        if total_cost <= budget and total_profit > best_profit:
+            best_profit = total_profit
+            best_mask = mask
+
+    return best_profit, best_mask
+
+
+def parallel_find_best_combination(actions, budget=BUDGET, max_workers=None):
+    """
+    Recherche exhaustive parallèle.
+    Les 2^n sous-ensembles sont découpés en plages de rangs réparties entre les processus ;
+    chaque processus parcourt sa plage dans l'ordre du code de Gray (voir gray_code_search).
+    Les meilleurs résultats de chaque plage sont ensuite comparés.
+    :param actions:
+    :param budget:
+    :param max_workers: nombre de processus (par défaut, le nombre de coeurs)
+    :return best_combination:
+    :return best_profit:
+    :return best_combination_cost:
+    :return total_combinations:
+    """
+    # Coûts en centimes entiers pour que les additions et soustractions successives restent exactes
+    costs = [round(cost * 100) for cost in actions.costs]
+    profits = actions.profit_amount
+    budget_in_cents = round(budget * 100)
+
+    total_subsets = 1 << len(actions)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk_count = min(total_subsets, max_workers * 4)
+    bounds = [total_subsets * chunk // chunk_count for chunk in range(chunk_count + 1)]
+
+    best_profit = 0
+    best_mask = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # map conserve l'ordre des plages : en cas d'égalité, la première plage l'emporte
+        for chunk_profit, chunk_mask in executor.map(gray_code_search, repeat(costs), repeat(profits),
+                                                     repeat(budget_in_cents), bounds[:-1], bounds[1:]):
+            if chunk_profit > best_profit:
+                best_profit = chunk_profit
+                best_mask = chunk_mask
+
+    best_combination = tuple(index for index in range(len(actions)) if best_mask >> index & 1)
+    best_combination_cost, best_profit = calculate_profit_combinations(actions, best_combination)
+    # Même décompte que find_best_combination : tous les sous-ensembles non vides
+    return best_combination, best_profit, best_combination_cost, total_subsets - 1
+
+
+def enumerate_subset_sums(actions, budget=BUDGET):
+    """
+    Énumérer le coût et le profit de tous les sous-ensembles d'une liste d'actions
+    qui tiennent dans le budget. Chaque sous-ensemble est construit à partir d'un plus petit,
+    en ajoutant une seule action : le coût et le profit ne sont pas recalculés depuis zéro.
+    :param actions:
+    :param budget:
+    :return subset_sums: liste de tuples (coût, profit, masque des actions choisies)
+    """
+    subset_sums = [(0, 0, 0)]
+    for index, (cost, profit) in enumerate(zip(actions.costs, actions.profit_amount)):
+        bit = 1 << index
+        subset_sums += [(subset_cost + cost, subset_profit + profit, mask | bit)
+                        for subset_cost, subset_profit, mask in subset_sums
+                        if subset_cost + cost <= budget]
+    return subset_sums
+
+
+def meet_in_the_middle_best_combination(actions, budget=BUDGET):
+    """
+    Recherche exacte « meet in the middle » (Horowitz et Sahni).
+    Les actions sont coupées en deux moitiés dont on énumère les sommes (coût, profit).
+    Dans la seconde moitié, on ne garde que les sous-ensembles non dominés (aucun autre n'est
+    moins cher et plus rentable), triés par coût. Un seul balayage des deux listes triées
+    associe chaque sous-ensemble de la première moitié au meilleur complément possible.
+    Complexité en O(2^(n/2) * n) au lieu de O(2^n * n) pour find_best_combination.
+    :param actions:
+    :param budget:
+    :return best_combination:
+    :return best_profit:
+    :return best_combination_cost:
+    :return total_combinations: nombre de sous-ensembles énumérés dans les deux moitiés
+    """
+    middle = len(actions) // 2
+    first_half = enumerate_subset_sums(actions[:middle], budget)
+    second_half = enumerate_subset_sums(actions[middle:], budget)
+    total_combinations = len(first_half) + len(second_half)
+
+    # Supprimer les sous-ensembles dominés de la seconde moitié :
+    # triés par coût croissant, le profit doit être strictement croissant
+    second_half.sort(key=lambda subset: (subset[0], -subset[1]))
+    frontier = []
+    for subset in second_half:
+        if not frontier or subset[1] > frontier[-1][1]:
+            frontier.append(subset)
+
+    # Balayage : quand le coût de la première moitié augmente, le meilleur complément
+    # abordable ne peut que reculer dans la frontière
+    first_half.sort(key=lambda subset: subset[0])
+    best_profit = 0
+    best_mask = 0
+    position = len(frontier) - 1
+    for first_cost, first_profit, first_mask in first_half:
+        while position >= 0 and first_cost + frontier[position][0] > budget:
+            position -= 1
+        if position < 0:
+            break
+        second_cost, second_profit, second_mask = frontier[position]
+        if first_profit + second_profit > best_profit:
+            best_profit = first_profit + second_profit
+            best_mask = first_mask | (second_mask << middle)
+
+    # Reconstituer la combinaison (indices dans l'ordre des actions, comme itertools.combinations)
+    best_combination = tuple(index for index in range(len(actions)) if best_mask >> index & 1)
+    best_combination_cost, best_profit = calculate_profit_combinations(actions, best_combination)
+    return best_combination, best_profit, best_combination_cost, total_combinations
+
+
 def display_results(execution_time, best_combination, best_profit,
                     best_combination_cost, total_combinations):
     """
@@ -119,25 +322,33 @@ def plot_complexity(sizes, execution_times):
     plt.show()
 
 
-def main():
+SEARCH_MODES = {
+    "exhaustive": find_best_combination,
+    "parallel": parallel_find_best_combination,
+    "meet_in_the_middle": meet_in_the_middle_best_combination,
+}
+
+
+def main(search_mode=SEARCH_MODE):
+    search = SEARCH_MODES[search_mode]
     raw_data = load_dataset(CSV_FILE)
     cleaned_data = clean_dataset(raw_data)
-    actions = cleaned_data.to_dict('records')
+    actions = ActionSet.from_dataframe(cleaned_data)
     sizes = []
     execution_times = []
     step = 1
     for size in range(step, len(actions) + 1, step):
         sample_actions = actions[:size]
-        start_time = time.time()
+        start_time = perf_counter()
         (best_combination, best_profit, best_combination_cost,
-         total_combinations) = find_best_combination(sample_actions, BUDGET)
-        end_time = time.time()
+         total_combinations) = search(sample_actions, BUDGET)
+        end_time = perf_counter()
         execution_time = end_time - start_time
         sizes.append(size)
         execution_times.append(execution_time)
 
     plot_complexity(sizes, execution_times)
-    display_results(execution_time, best_combination,
+    display_results(execution_time, actions.records(best_combination),
                     best_profit, best_combination_cost, total_combinations)
 
 if __name__ == "__main__":
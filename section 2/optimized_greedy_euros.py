@@ -1,5 +1,5 @@
 import pandas as pd
-import time
+from time import perf_counter
 
 CSV_FILE = "../datasets/actions_list.csv"
 BUDGET = 500
@@ -64,9 +64,9 @@ def main():
     cleaned_data = clean_dataset(raw_data)
     actions = cleaned_data.to_dict('records')
 
-    start_time = time.time()
+    start_time = perf_counter()
     best_combination, best_profit, best_combination_cost, total_combination = greedy_best_combination(actions, BUDGET)
-    end_time = time.time()
+    end_time = perf_counter()
     execution_time = end_time - start_time
     display_results(execution_time, best_combination, best_profit, best_combination_cost, total_combination)
 
@@ -1,10 +1,13 @@
+import numpy as np
 import pandas as pd
-import time
-from memory_profiler import profile
+import tracemalloc
+from time import perf_counter
 
 
 CSV_FILE = "../datasets/actions_list.csv"
 BUDGET = 50000  # Le budget est maintenant en centimes (500 euros * 100)
+KNAPSACK_BACKEND = "numpy"  # "python" ou "numpy"
+PROFILE_MEMORY = False  # True pour mesurer le pic de mémoire de l'algorithme (tracemalloc, plus lent)
 
 def load_dataset(csv_file):
     dataframe = pd.read_csv(csv_file)
@@ -20,19 +23,16 @@ def clean_dataset(dataframe):
     return dataframe
 
 # Fonction pour trouver la meilleure combinaison d'actions avec programmation dynamique
-@profile
-def find_best_combination(actions, budget=BUDGET):
+def find_best_combination(actions, budget=BUDGET, backend=KNAPSACK_BACKEND):
+    if backend == "numpy":
+        return find_best_combination_numpy(actions, budget)
+
     # Créer un tableau pour stocker le meilleur profit pour chaque budget (de 0 à 50000). Commence à 0 d'où le + 1
     max_profit_for_budget = [0] * (budget + 1)
-    # Créer un tableau pour stocker les actions sélectionnées pour chaque budget
-    #selected_actions = [
-    #[],  # Indice 0 : budget de 0 centime
-    #[],  # Indice 1 : budget de 1 centime
-    #"[],  # Indice 2 : budget de 2 centimes
-    #"...
-    #[],  # Indice 500 : budget de 500 centimes
-#]
-    selected_actions = [[] for _ in range(budget + 1)]
+    # Créer une matrice de décisions : pour chaque action, un bit par niveau de budget
+    # indique si l'action a été prise à ce niveau (n * 50001 / 8 octets au lieu de 50001 listes)
+    decisions = []
+    costs = []
     # Variable pour compter le nombre total de combinaisons évaluées
     total_combinations = 0
 
@@ -40,16 +40,77 @@ def find_best_combination(actions, budget=BUDGET):
     for action in actions:
         cost = int(action['cost'])  # On récupère le coût de l'action
         profit = action['profit_amount']
+        taken = bytearray(budget // 8 + 1)
 
         # Mettre à jour le tableau dp de manière descendante pour éviter d'écraser les données
         for budget_level in range(budget, cost - 1, -1): # Start = budget, stop = cost-1 (sinon coût exclus), step = -1
             total_combinations += 1
             if max_profit_for_budget[budget_level - cost] + profit > max_profit_for_budget[budget_level]:
                 max_profit_for_budget[budget_level] = max_profit_for_budget[budget_level - cost] + profit
-                selected_actions[budget_level] = selected_actions[budget_level - cost] + [action]
+                taken[budget_level >> 3] |= 1 << (budget_level & 7)
+
+        decisions.append(taken)
+        costs.append(cost)
+
+    # Le meilleur profit sera à dp[budget], les actions sont retrouvées en remontant les décisions
+    best_combination = reconstruct_combination(actions, costs, decisions, budget)
+    return best_combination, max_profit_for_budget[budget], total_combinations
+
+def find_best_combination_numpy(actions, budget=BUDGET):
+    """
+    Version vectorisée : chaque action est traitée en une seule opération sur toute la ligne
+    max_profit_for_budget. Retourne la même sélection et le même profit que la boucle de référence.
+    :param actions:
+    :param budget:
+    :return best_combination:
+    :return max_profit_for_budget[budget]:
+    :return total_combinations:
+    """
+    max_profit_for_budget = np.zeros(budget + 1)
+    # Matrice de décisions compactée : un bit par action et par niveau de budget
+    decisions = np.zeros((len(actions), budget // 8 + 1), dtype=np.uint8)
+    costs = []
+    total_combinations = 0
+
+    for index, action in enumerate(actions):
+        cost = int(action['cost'])
+        profit = action['profit_amount']
+        costs.append(cost)
+        if cost > budget:
+            continue
+        total_combinations += budget - cost + 1
+
+        # Profit obtenu en ajoutant l'action à chaque niveau de budget (calculé sur la ligne avant mise à jour)
+        candidate_profit = max_profit_for_budget[:budget + 1 - cost] + profit
+        improved = candidate_profit > max_profit_for_budget[cost:]
+        max_profit_for_budget[cost:][improved] = candidate_profit[improved]
+
+        # Mémoriser les niveaux de budget où l'action est prise
+        taken = np.zeros(budget + 1, dtype=bool)
+        taken[cost:] = improved
+        decisions[index] = np.packbits(taken, bitorder='little')
+
+    best_combination = reconstruct_combination(actions, costs, decisions, budget)
+    return best_combination, float(max_profit_for_budget[budget]), total_combinations
+
 
-    # Le meilleur profit sera à dp[budget], avec les actions correspondantes
-    return selected_actions[budget], max_profit_for_budget[budget], total_combinations
+def reconstruct_combination(actions, costs, decisions, budget=BUDGET):
+    """
+    Reconstruire la meilleure combinaison en remontant la matrice de décisions.
+    :param actions:
+    :param costs:
+    :param decisions: un bit par action et par niveau de budget (1 = action prise)
+    :param budget:
+    :return best_combination:
+    """
+    best_combination = []
+    budget_level = budget
+    for index in range(len(actions) - 1, -1, -1):
+        if (decisions[index][budget_level >> 3] >> (budget_level & 7)) & 1:
+            best_combination.append(actions[index])
+            budget_level -= costs[index]
+    best_combination.reverse()
+    return best_combination
 
 def display_results(execution_time, best_combination, best_profit, best_combination_cost, total_combinations):
     # Premier tableau : Résumé des résultats
@@ -73,14 +134,20 @@ def main(CSV_FILE):
     cleaned_data = clean_dataset(raw_data)
     actions = cleaned_data.to_dict('records')
 
+    if PROFILE_MEMORY:
+        tracemalloc.start()
     # Démarrer le chronomètre uniquement pour l'algorithme
-    start_time = time.time()
+    start_time = perf_counter()
     # Trouver la meilleure combinaison d'actions dans le budget avec programmation dynamique
     best_combination, best_profit, total_combinations = find_best_combination(actions)
     # Arrêter le chronomètre
-    end_time = time.time()
+    end_time = perf_counter()
     # Calculer la durée d'exécution
     execution_time = end_time - start_time
+    if PROFILE_MEMORY:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Pic de mémoire de l'algorithme : {peak_memory / 1024 / 1024:.2f} Mo")
 
     # Calculer le coût total des actions sélectionnées
     best_combination_cost = sum(action['cost'] for action in best_combination)
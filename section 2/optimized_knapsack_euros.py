@@ -1,5 +1,5 @@
 import pandas as pd
-import time
+from time import perf_counter
 
 CSV_FILE = "../datasets/actions_list.csv"
 BUDGET = 500
@@ -64,11 +64,11 @@ def process_dataset(CSV_FILE):
     actions = cleaned_data.to_dict('records')
 
     # Démarrer le chronomètre uniquement pour l'algorithme
-    start_time = time.time()
+    start_time = perf_counter()
     # Trouver la meilleure combinaison d'actions dans le budget avec programmation dynamique
     best_combination, best_profit, total_combinations= find_best_combination(actions)
     # Arrêter le chronomètre
-    end_time = time.time()
+    end_time = perf_counter()
     # Calculer la durée d'exécution
     execution_time = end_time - start_time
 
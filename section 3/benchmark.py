@@ -0,0 +1,282 @@
+import argparse
+import csv
+import importlib.util
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import cache, partial
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from optimized import (FPTAS_EPSILON, branch_and_bound_best_combination, fptas_best_combination,
+                       greedy_best_combination, improved_greedy_best_combination, knapsack_best_combination,
+                       load_actions)
+
+try:
+    import resource
+except ImportError:  # Windows : pas de mesure de la mémoire résidente
+    resource = None
+
+
+SIZES = [10, 15, 20, 100, 1000, 10000, 100000, 1000000]
+BUDGETS = [500 * 100, 5000 * 100, 100000 * 100]  # Budgets en centimes (jusqu'à 10^7)
+SEED = 0
+DP_MAX_CELLS = 10 ** 9  # Taille maximale du tableau de programmation dynamique (actions x niveaux de budget)
+BRANCH_AND_BOUND_MAX_ACTIONS = 100000
+BRUTEFORCE_MAX_ACTIONS = 20
+REGRESSION_THRESHOLD = 0.2  # Hausse relative tolérée du temps ou de la mémoire
+MIN_COMPARED_TIME = 0.01  # En dessous (secondes), les écarts de temps sont du bruit de mesure
+
+BRUTEFORCE_FILE = Path(__file__).resolve().parent.parent / "section 1" / "bruteforce.py"
+
+
+def generate_universe(size, seed=SEED):
+    """
+    Générer un univers synthétique reproductible.
+    Comme les jeux de données fournis, il contient quelques lignes invalides
+    (prix négatifs ou nuls, bénéfices nuls) et quelques noms en double.
+    :param size: nombre de lignes
+    :param seed:
+    :return names, prices, profits: noms, prix en euros et bénéfices en pourcentage
+    """
+    generator = np.random.default_rng([seed, size])
+    prices = np.round(generator.uniform(1, 500, size), 2)
+    profits = np.round(generator.uniform(0.5, 40, size), 2)
+
+    # Environ 1 % de lignes invalides et 0,5 % de doublons
+    invalid = generator.random(size) < 0.01
+    prices[invalid] = -prices[invalid]
+    profits[generator.random(size) < 0.005] = 0
+    names = [f"Share-{index:07d}" for index in range(size)]
+    for index in np.flatnonzero(generator.random(size) < 0.005):
+        names[index] = names[generator.integers(size)]
+    return names, prices, profits
+
+
+def write_universe(file, names, prices, profits, schema="shares"):
+    """
+    Écrire un univers dans l'un des deux formats CSV.
+    :param file:
+    :param names:
+    :param prices:
+    :param profits:
+    :param schema: "shares" (name,price,profit) ou "actions" (format de actions_list.csv)
+    """
+    with open(file, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        if schema == "actions":
+            writer.writerow(['Actions #', 'Coût par action (en euros)', 'Bénéfice (après 2 ans)'])
+            writer.writerows((name, f"{price:.2f}", f"{profit:g}%") for name, price, profit in zip(names, prices, profits))
+        else:
+            writer.writerow(['name', 'price', 'profit'])
+            writer.writerows((name, f"{price:.2f}", f"{profit:.2f}") for name, price, profit in zip(names, prices, profits))
+
+
+@cache
+def load_bruteforce():
+    """
+    Charger le module de force brute de la section 1 (une seule fois par processus).
+    """
+    specification = importlib.util.spec_from_file_location("bruteforce", BRUTEFORCE_FILE)
+    module = importlib.util.module_from_spec(specification)
+    specification.loader.exec_module(module)
+    return module
+
+
+def bruteforce_best_combination(actions, budget):
+    """
+    Recherche exhaustive de la section 1 (en euros) sur un ensemble d'actions de la section 3.
+    """
+    bruteforce = load_bruteforce()
+    euro_actions = bruteforce.ActionSet(actions.names, (actions.cost_cents / 100).tolist(),
+                                        actions.profit.tolist(), (actions.profit_amount / 100).tolist())
+    best_combination, best_profit, _, total_combinations = bruteforce.find_best_combination(euro_actions, budget / 100)
+    return list(best_combination), best_profit * 100, total_combinations
+
+
+# Algorithmes mesurés et condition pour qu'ils restent réalisables
+SOLVERS = {
+    "glouton": (greedy_best_combination, lambda size, budget: True),
+    "glouton_ameliore": (improved_greedy_best_combination, lambda size, budget: True),
+    "programmation_dynamique": (knapsack_best_combination, lambda size, budget: size * (budget + 1) <= DP_MAX_CELLS),
+    # Mémoire linéaire : seul le temps de calcul limite la taille
+    "programmation_dynamique_lineaire": (partial(knapsack_best_combination, backend="hirschberg"),
+                                         lambda size, budget: size * (budget + 1) <= 8 * DP_MAX_CELLS),
+    # États non dominés : au pire autant d'états que de niveaux de budget, pour chaque action
+    "programmation_dynamique_pareto": (partial(knapsack_best_combination, backend="pareto"),
+                                       lambda size, budget: size * min(budget + 1, 2 ** min(size, 62)) <= DP_MAX_CELLS),
+    "separation_evaluation": (branch_and_bound_best_combination,
+                              lambda size, budget: size <= BRANCH_AND_BOUND_MAX_ACTIONS),
+    "fptas": (fptas_best_combination, lambda size, budget: 2 * size * size / FPTAS_EPSILON <= DP_MAX_CELLS),
+    "force_brute": (bruteforce_best_combination, lambda size, budget: size <= BRUTEFORCE_MAX_ACTIONS),
+}
+
+# Préparations lancées avant la mesure du temps (import des modules coûteux comme pandas et matplotlib)
+SOLVER_SETUP = {
+    "force_brute": load_bruteforce,
+}
+
+# Algorithmes exacts : leur profit ne doit pas changer d'une campagne à l'autre
+EXACT_SOLVERS = ("programmation_dynamique", "programmation_dynamique_lineaire", "programmation_dynamique_pareto",
+                 "separation_evaluation", "force_brute")
+
+
+def peak_rss_kib():
+    """
+    Pic de mémoire résidente du processus, en Kio (None si la mesure n'est pas disponible).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux compte en Kio, macOS en octets
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(solver_name, file, budget):
+    """
+    Charger un univers et lancer un algorithme. Exécuté dans un processus neuf, démarré par "spawn"
+    (et non par fork, qui hériterait du pic de mémoire du processus parent),
+    pour que le pic de mémoire mesuré soit celui de cet algorithme seulement.
+    :return measurement:
+    """
+    start_time = perf_counter()
+    actions = load_actions(file, budget)
+    load_time = perf_counter() - start_time
+
+    solver, _ = SOLVERS[solver_name]
+    if solver_name in SOLVER_SETUP:
+        SOLVER_SETUP[solver_name]()
+    rss_before = peak_rss_kib()
+
+    start_time = perf_counter()
+    solution = solver(actions, budget)
+    wall_time = perf_counter() - start_time
+
+    return {
+        "actions": len(actions),
+        "load_time": load_time,
+        "wall_time": wall_time,
+        "peak_rss_kib": peak_rss_kib(),
+        "rss_before_kib": rss_before,
+        "operations": int(solution[-1]),
+        "profit": float(solution[1]),
+    }
+
+
+def run_benchmark(sizes=SIZES, budgets=BUDGETS, solvers=tuple(SOLVERS), seed=SEED):
+    """
+    Mesurer chaque algorithme sur une grille de tailles et de budgets.
+    :return results: dictionnaire sérialisable en JSON
+    """
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            file = Path(directory) / f"universe_{size}.csv"
+            write_universe(file, *generate_universe(size, seed))
+            for budget in budgets:
+                for solver_name in solvers:
+                    run = {"size": size, "budget": budget, "algorithm": solver_name}
+                    if not SOLVERS[solver_name][1](size, budget):
+                        runs.append(dict(run, skipped=True))
+                        continue
+                    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                        run.update(executor.submit(measure, solver_name, str(file), budget).result())
+                    print(f"{size:>8} actions, budget {budget / 100:>10.2f} €, {solver_name:<24} "
+                          f"{run['wall_time']:.4f} s")
+                    runs.append(dict(run, skipped=False))
+
+    return {
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "runs": runs,
+    }
+
+
+def compare_results(baseline, candidate, threshold=REGRESSION_THRESHOLD):
+    """
+    Comparer deux campagnes de mesures.
+    Une régression est signalée quand le temps ou le pic de mémoire augmente de plus de threshold,
+    ou quand un algorithme exact ne trouve plus le même profit.
+    :return regressions: liste de messages
+    """
+    def index(results):
+        return {(run["size"], run["budget"], run["algorithm"]): run for run in results["runs"] if not run["skipped"]}
+
+    baseline_runs = index(baseline)
+    regressions = []
+    for key, run in sorted(index(candidate).items()):
+        reference = baseline_runs.get(key)
+        if reference is None:
+            continue
+        label = f"{key[0]} actions, budget {key[1] / 100:.2f} €, {key[2]}"
+
+        if (run["wall_time"] > MIN_COMPARED_TIME
+                and run["wall_time"] > reference["wall_time"] * (1 + threshold)):
+            regressions.append(f"{label} : temps {reference['wall_time']:.4f} s -> {run['wall_time']:.4f} s")
+        if (run["peak_rss_kib"] and reference["peak_rss_kib"]
+                and run["peak_rss_kib"] > reference["peak_rss_kib"] * (1 + threshold)):
+            regressions.append(f"{label} : mémoire {reference['peak_rss_kib']} Kio -> {run['peak_rss_kib']} Kio")
+        if key[2] in EXACT_SOLVERS and abs(run["profit"] - reference["profit"]) > 1e-6:
+            regressions.append(f"{label} : profit {reference['profit']:.2f} -> {run['profit']:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performance des algorithmes de sélection d'actions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="écrire des univers synthétiques dans les deux formats CSV")
+    generate.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    generate.add_argument("--seed", type=int, default=SEED)
+    generate.add_argument("--output", default="synthetic", help="dossier de sortie")
+
+    run = commands.add_parser("run", help="mesurer les algorithmes sur une grille de tailles et de budgets")
+    run.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    run.add_argument("--budgets", type=int, nargs="+", default=BUDGETS, help="budgets en centimes")
+    run.add_argument("--algorithms", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    run.add_argument("--seed", type=int, default=SEED)
+    run.add_argument("--output", default="benchmark.json")
+
+    compare = commands.add_parser("compare", help="signaler les régressions entre deux campagnes")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    arguments = parser.parse_args()
+    if arguments.command == "generate":
+        output = Path(arguments.output)
+        output.mkdir(parents=True, exist_ok=True)
+        for size in arguments.sizes:
+            universe = generate_universe(size, arguments.seed)
+            write_universe(output / f"shares_{size}.csv", *universe, schema="shares")
+            write_universe(output / f"actions_{size}.csv", *universe, schema="actions")
+        print(f"{2 * len(arguments.sizes)} fichiers écrits dans {output}")
+
+    elif arguments.command == "run":
+        results = run_benchmark(arguments.sizes, arguments.budgets, arguments.algorithms, arguments.seed)
+        with open(arguments.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"Résultats écrits dans {arguments.output}")
+
+    else:
+        with open(arguments.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        with open(arguments.candidate, encoding='utf-8') as candidate_file:
+            candidate = json.load(candidate_file)
+        regressions = compare_results(baseline, candidate, arguments.threshold)
+        for regression in regressions:
+            print(f"Régression : {regression}")
+        print(f"{len(regressions)} régression(s)")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
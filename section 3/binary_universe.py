@@ -0,0 +1,142 @@
+import argparse
+import os
+import struct
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+
+UNIVERSE_SUFFIX = ".universe"
+MAGIC = b"KNAPSACK"
+VERSION = 1
+# En-tête : signature, version, options, nombre d'actions, taille de la table des noms, budget de conversion
+HEADER = struct.Struct("<8sIIQQq")
+HEADER_SIZE = 64  # Les colonnes commencent à un multiple de 8 octets
+HAS_LOTS = 1
+
+
+class NameTable(Sequence):
+    """
+    Noms des actions lus à la demande dans la table des noms (un bloc d'octets UTF-8 et les positions de début).
+    Seuls les noms consultés sont décodés.
+    """
+
+    __slots__ = ('blob', 'offsets')
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+
+def write_universe(file, names, cost_cents, profit, max_lots=None, budget=-1):
+    """
+    Écrire un univers nettoyé au format binaire en colonnes :
+    en-tête, coûts en centimes (int64), bénéfices (float64), nombres maximaux de lots (int64, facultatif),
+    positions des noms (int64, n + 1 valeurs) et table des noms.
+    :param file:
+    :param names:
+    :param cost_cents:
+    :param profit:
+    :param max_lots:
+    :param budget: budget (en centimes) utilisé pour le nettoyage, -1 si aucun
+    """
+    encoded_names = [str(name).encode('utf-8') for name in names]
+    offsets = np.zeros(len(encoded_names) + 1, dtype='<i8')
+    np.cumsum([len(name) for name in encoded_names], out=offsets[1:])
+    flags = HAS_LOTS if max_lots is not None else 0
+
+    with open(file, 'wb') as universe_file:
+        universe_file.write(HEADER.pack(MAGIC, VERSION, flags, len(encoded_names), int(offsets[-1]), budget)
+                            .ljust(HEADER_SIZE, b'\0'))
+        universe_file.write(np.asarray(cost_cents, dtype='<i8').tobytes())
+        universe_file.write(np.asarray(profit, dtype='<f8').tobytes())
+        if max_lots is not None:
+            universe_file.write(np.asarray(max_lots, dtype='<i8').tobytes())
+        universe_file.write(offsets.tobytes())
+        universe_file.write(b''.join(encoded_names))
+
+
+def read_universe(file):
+    """
+    Ouvrir un univers binaire sans le lire : les colonnes sont des vues numpy.memmap sur le fichier,
+    partagées par tous les processus qui l'ouvrent (même cache de pages).
+    :param file:
+    :return names: NameTable
+    :return cost_cents:
+    :return profit:
+    :return max_lots: None si le fichier n'en contient pas
+    :return budget: budget de conversion en centimes (-1 si aucun)
+    """
+    with open(file, 'rb') as universe_file:
+        magic, version, flags, count, names_size, budget = HEADER.unpack(universe_file.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Format d'univers binaire inconnu : {file}")
+    columns = 3 if flags & HAS_LOTS else 2
+    expected_size = HEADER_SIZE + 8 * (columns * count + count + 1) + names_size
+    if os.path.getsize(file) != expected_size:
+        raise ValueError(f"Univers binaire tronqué ou corrompu : {file} "
+                         f"({os.path.getsize(file)} octets au lieu de {expected_size})")
+
+    data = np.memmap(file, dtype=np.uint8, mode='r')
+    position = HEADER_SIZE
+
+    def column(dtype, length):
+        nonlocal position
+        view = data[position:position + 8 * length].view(dtype)
+        position += 8 * length
+        return view
+
+    cost_cents = column('<i8', count)
+    profit = column('<f8', count)
+    max_lots = column('<i8', count) if flags & HAS_LOTS else None
+    offsets = column('<i8', count + 1)
+    names = NameTable(data[position:position + names_size], offsets)
+    return names, cost_cents, profit, max_lots, budget
+
+
+def convert(csv_file, universe_file, budget=None):
+    """
+    Nettoyer un fichier CSV (mêmes règles que load_actions) et l'écrire au format binaire.
+    :param csv_file:
+    :param universe_file:
+    :param budget: budget en centimes pour écarter les actions trop chères (None pour toutes les garder)
+    :return actions:
+    """
+    from optimized import load_actions
+
+    actions = load_actions(csv_file, budget if budget is not None else sys.maxsize)
+    write_universe(universe_file, actions.names, actions.cost_cents, actions.profit, actions.max_lots,
+                   budget if budget is not None else -1)
+    return actions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversion des univers CSV au format binaire.")
+    parser.add_argument("files", nargs="+", help="fichiers CSV à convertir")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="écarter les actions plus chères que ce budget (en euros)")
+    parser.add_argument("--output", default=None, help="dossier de sortie (par défaut, celui du fichier CSV)")
+    arguments = parser.parse_args()
+
+    for file in arguments.files:
+        output_directory = Path(arguments.output or Path(file).parent)
+        output_directory.mkdir(parents=True, exist_ok=True)
+        output = output_directory / (Path(file).stem + UNIVERSE_SUFFIX)
+        start_time = perf_counter()
+        actions = convert(file, output, None if arguments.budget is None else round(arguments.budget * 100))
+        print(f"{file} -> {output} : {len(actions)} actions ({perf_counter() - start_time:.4f} s)")
@@ -0,0 +1,84 @@
+import argparse
+import random
+import sys
+from itertools import combinations
+
+from optimized import (ActionSet, branch_and_bound_best_combination, cardinality_best_combination,
+                       cardinality_branch_and_bound)
+
+
+TRIALS = 300
+MAX_ACTIONS = 12  # L'énumération exhaustive parcourt 2^MAX_ACTIONS combinaisons par essai
+SEED = 0
+
+
+def random_actions(generator, size):
+    """
+    Petit univers aléatoire, avec des coûts répétés et des ex aequo de ratio.
+    """
+    costs = [generator.randint(1, 60) * generator.choice([1, 10]) for _ in range(size)]
+    rates = [generator.choice([0.05, 0.1, 0.2]) if generator.random() < 0.3 else round(generator.uniform(0.01, 0.4), 3)
+             for _ in range(size)]
+    return ActionSet([f"Share-{index}" for index in range(size)], costs, rates)
+
+
+def exhaustive_profit(actions, budget, max_positions):
+    """
+    Meilleur profit par énumération de toutes les combinaisons d'au plus max_positions actions.
+    """
+    costs = actions.cost_cents.tolist()
+    profits = actions.profit_amount.tolist()
+    best_profit = 0
+    for size in range(1, min(max_positions, len(actions)) + 1):
+        for combination in combinations(range(len(actions)), size):
+            if sum(costs[index] for index in combination) <= budget:
+                best_profit = max(best_profit, sum(profits[index] for index in combination))
+    return best_profit
+
+
+def check(trials=TRIALS, max_actions=MAX_ACTIONS, seed=SEED):
+    """
+    Comparer la programmation dynamique avec nombre de positions, la séparation et évaluation avec nombre
+    de positions et la séparation et évaluation sans limite à l'énumération exhaustive.
+    :return mismatches: liste de messages
+    """
+    generator = random.Random(seed)
+    mismatches = []
+    for trial in range(trials):
+        actions = random_actions(generator, generator.randint(0, max_actions))
+        budget = generator.randint(1, 1500)
+        solvers = {
+            "programmation dynamique": lambda positions: cardinality_best_combination(actions, budget, positions),
+            "séparation et évaluation": lambda positions: cardinality_branch_and_bound(actions, budget, positions),
+        }
+        for max_positions in range(1, len(actions) + 1):
+            expected = exhaustive_profit(actions, budget, max_positions)
+            for solver_name, solver in solvers.items():
+                combination, profit, _ = solver(max_positions)
+                if (abs(profit - expected) > 1e-6 or len(combination) > max_positions
+                        or actions.selection_cost(combination) > budget
+                        or abs(float(actions.profit_amount[combination].sum()) - profit) > 1e-6):
+                    mismatches.append(f"essai {trial}, {max_positions} positions, {solver_name} : "
+                                      f"{profit:.4f} au lieu de {expected:.4f}")
+
+        # Sans limite de positions, l'exploration commune doit retrouver le même optimum
+        expected = exhaustive_profit(actions, budget, len(actions))
+        _, profit, _ = branch_and_bound_best_combination(actions, budget)
+        if abs(profit - expected) > 1e-6:
+            mismatches.append(f"essai {trial}, sans limite : {profit:.4f} au lieu de {expected:.4f}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vérification des recherches avec nombre de positions limité "
+                                                 "par énumération exhaustive.")
+    parser.add_argument("--trials", type=int, default=TRIALS)
+    parser.add_argument("--max-actions", type=int, default=MAX_ACTIONS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    arguments = parser.parse_args()
+
+    mismatches = check(arguments.trials, arguments.max_actions, arguments.seed)
+    for mismatch in mismatches:
+        print(mismatch)
+    print(f"{arguments.trials} essais, {len(mismatches)} écart(s)")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+import tracemalloc
+from time import perf_counter, time
+
+
+# Variables d'environnement lues au démarrage (elles sont transmises aux processus du mode lot)
+OUTPUT_VARIABLE = "KNAPSACK_INSTRUMENTATION"  # Fichier JSON Lines des mesures ("-" pour la sortie standard)
+MEMORY_VARIABLE = "KNAPSACK_TRACEMALLOC"  # "1" pour mesurer aussi le pic de mémoire avec tracemalloc
+
+
+class Phase:
+    """
+    Mesure d'une phase (chargement, nettoyage, résolution, reconstruction, affichage).
+    S'utilise avec with ; le compteur d'opérations est alimenté par count().
+    """
+
+    __slots__ = ('instrumentation', 'name', 'fields', 'operations', 'parent', 'start_time', 'peak_memory')
+
+    def __init__(self, instrumentation, name, fields):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.fields = fields
+        self.operations = 0
+        self.parent = None
+        self.start_time = None
+        self.peak_memory = 0
+
+    def count(self, operations=1):
+        """
+        Ajouter des opérations au compteur de la phase.
+        """
+        self.operations += operations
+
+    def __enter__(self):
+        stack = self.instrumentation.stack
+        self.parent = stack[-1] if stack else None
+        if self.instrumentation.trace_memory:
+            # Le pic courant appartient à la phase parente : on le lui transmet avant de le remettre à zéro
+            if self.parent is not None:
+                self.parent.peak_memory = max(self.parent.peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.start_time = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = perf_counter() - self.start_time
+        self.instrumentation.stack.pop()
+        peak_memory = None
+        if self.instrumentation.trace_memory:
+            peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            if self.parent is not None:
+                self.parent.peak_memory = max(self.parent.peak_memory, peak_memory)
+
+        self.instrumentation.emit(dict(
+            self.fields,
+            phase=self.name,
+            parent=self.parent.name if self.parent is not None else None,
+            duration=duration,
+            operations=self.operations,
+            peak_memory=peak_memory,
+            failed=exc_type is not None,
+            pid=os.getpid(),
+            timestamp=time(),
+        ))
+        return False
+
+
+class DisabledPhase:
+    """
+    Phase vide utilisée quand l'instrumentation est désactivée : aucune mesure, aucun enregistrement.
+    """
+
+    __slots__ = ()
+
+    def count(self, operations=1):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+DISABLED_PHASE = DisabledPhase()
+
+
+class Instrumentation:
+    """
+    Mesures optionnelles par phase : durée (perf_counter), pic de mémoire (tracemalloc)
+    et nombre d'opérations des boucles internes.
+    Chaque phase produit un enregistrement structuré (dictionnaire), gardé dans records
+    et écrit en JSON Lines si une sortie est configurée.
+    Désactivée, phase() renvoie toujours la même phase vide : le coût se limite à un appel de fonction.
+    """
+
+    def __init__(self, enabled=False, trace_memory=False, output=None):
+        self.enabled = False
+        self.trace_memory = False
+        self.output = None
+        self.records = []
+        self.stack = []
+        self.configure(enabled, trace_memory, output)
+
+    def configure(self, enabled=True, trace_memory=False, output=None):
+        """
+        :param enabled:
+        :param trace_memory: mesurer le pic de mémoire (ralentit nettement les boucles Python)
+        :param output: fichier JSON Lines ("-" pour la sortie standard, None pour garder les mesures en mémoire)
+        """
+        self.enabled = enabled
+        self.output = output
+        self.trace_memory = enabled and trace_memory
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name, **fields):
+        """
+        :param name: nom de la phase ("load", "clean", "solve", "reconstruct", "display")
+        :param fields: informations ajoutées à l'enregistrement (fichier, algorithme...)
+        :return phase: à utiliser avec with
+        """
+        if not self.enabled:
+            return DISABLED_PHASE
+        return Phase(self, name, fields)
+
+    def emit(self, record):
+        """
+        Enregistrer une mesure et l'écrire sur la sortie configurée.
+        """
+        self.records.append(record)
+        if self.output is None:
+            return
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self.output == "-":
+            sys.stdout.write(line)
+        else:
+            # Une ligne par écriture en mode ajout : plusieurs processus peuvent partager le fichier
+            with open(self.output, 'a', encoding='utf-8') as output_file:
+                output_file.write(line)
+
+
+def configure_from_environment():
+    """
+    Activer l'instrumentation si la variable d'environnement OUTPUT_VARIABLE est définie.
+    """
+    output = os.environ.get(OUTPUT_VARIABLE)
+    if output:
+        instrumentation.configure(True, os.environ.get(MEMORY_VARIABLE) == "1", output)
+
+
+instrumentation = Instrumentation()
+configure_from_environment()
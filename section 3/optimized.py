@@ -1,9 +1,56 @@
+import argparse
+import csv
+from bisect import bisect_right, insort
+from heapq import heappush, heappushpop
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import accumulate
+from math import ceil, gcd, isqrt
+import os
+import numpy as np
 import pandas as pd
 from time import perf_counter
 
+from binary_universe import UNIVERSE_SUFFIX, read_universe
+from instrumentation import MEMORY_VARIABLE, OUTPUT_VARIABLE, instrumentation
+from result_cache import CACHE_DIRECTORY, ResultCache, action_set_digest, cache_key
+
 
 CSV_FILES = ["../datasets/actions_list.csv", "../datasets/dataset1_Python+P7.csv", "../datasets/dataset2_Python+P7.csv"]
 BUDGET = 500 * 100  # Budget en centimes
+# Moteur du sac à dos : "python" (boucle de référence), "numpy" (vectorisé),
+# "hirschberg" (vectorisé, mémoire proportionnelle au budget seulement), "pareto" (états non dominés)
+# ou "auto" (pareto quand l'ensemble des états s'annonce petit, numpy sinon, voir pareto_is_small)
+KNAPSACK_BACKEND = "auto"
+PARETO_MIN_CELLS = 2 ** 26  # En dessous de cette taille de tableau, le mode "auto" choisit numpy sans estimation
+PARETO_PROBE_ACTIONS = 64  # Actions utilisées pour estimer la croissance des états non dominés
+PARETO_STATE_COST = 35  # Un état fusionné coûte à peu près autant que ce nombre de cases du tableau numpy (mesuré)
+PARETO_ABORT_FACTOR = 4  # L'estimation peut sous-évaluer les états : n'abandonner qu'au-delà de ce facteur
+# En dessous de ce nombre de cases (actions x niveaux de budget), Hirschberg termine avec la matrice de décisions
+HIRSCHBERG_BASE_CELLS = 2 ** 20
+FPTAS_EPSILON = 0.1  # Perte de profit relative maximale acceptée par l'approximation (10 %)
+FPTAS_NAME = "Approximation FPTAS"
+# Recherche locale du glouton amélioré : actions retirables, actions ajoutables et nombre d'échanges au plus
+LOCAL_SEARCH_SELECTED = 20
+LOCAL_SEARCH_CANDIDATES = 50
+LOCAL_SEARCH_ITERATIONS = 100
+CORE_NAME = "Réduction au noyau"
+MAX_LOTS = 1  # Nombre maximal de lots par action quand le fichier ne le précise pas
+CARDINALITY_NAME = "Nombre de positions limité"
+# Au-delà de ce nombre de cases (actions x positions x niveaux de budget), la séparation et évaluation remplace
+# la programmation dynamique (un bit de décision par case, soit 128 Mo)
+CARDINALITY_DP_MAX_CELLS = 2 ** 30
+TOP_K = 10  # Nombre de meilleurs portefeuilles distincts affichés par --top
+CORE_TOLERANCE = 1e-6  # Marge (en centimes) pour ne fixer une action que si la borne est nettement sous la solution
+
+# Noms de colonnes des deux formats de fichiers CSV
+COLUMN_MAPPING = {
+    'Coût par action (en euros)': 'cost',
+    'price': 'cost',
+    'Actions #': 'name',
+    'Bénéfice (après 2 ans)': 'profit',
+    'Lots maximum': 'max_lots',
+}
 
 
 def upload_data(file):
@@ -13,16 +60,25 @@ def upload_data(file):
     :return:
     """
     # Charger les données et créer une copie du fichier
-    dataframe = pd.read_csv(file).copy()
+    with instrumentation.phase("load", file=file) as phase:
+        dataframe = pd.read_csv(file).copy()
+        phase.count(len(dataframe))
 
+    with instrumentation.phase("clean", file=file) as phase:
+        phase.count(len(dataframe))
+        dataframe = clean_data(dataframe)
+
+    return dataframe
+
+
+def clean_data(dataframe):
+    """
+    Nettoyer les données chargées par upload_data
+    :param dataframe:
+    :return:
+    """
     # Renommer les colonnes des fichiers CSV
-    column_mapping = {
-        'Coût par action (en euros)': 'cost',
-        'price': 'cost',
-        'Actions #': 'name',
-        'Bénéfice (après 2 ans)': 'profit',
-    }
-    dataframe.rename(columns=column_mapping, inplace=True)
+    dataframe.rename(columns=COLUMN_MAPPING, inplace=True)
 
     # Supprimer les lignes avec des valeurs manquantes
     dataframe.dropna(subset=['cost', 'profit'], inplace=True)
@@ -48,6 +104,219 @@ def upload_data(file):
     return dataframe
 
 
+def parse_cents(text):
+    """
+    Convertir un prix en euros (texte) en centimes entiers, sans troncature.
+    :param text:
+    :return cents: None si le prix est vide ou invalide
+    """
+    try:
+        return round(float(text) * 100)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def parse_rate(text):
+    """
+    Convertir un bénéfice en pourcentage (texte, avec ou sans %) en décimale.
+    :param text:
+    :return rate: None si le bénéfice est vide ou invalide
+    """
+    try:
+        rate = float(text.replace('%', '')) / 100
+    except (AttributeError, ValueError):
+        return None
+    return None if rate != rate else rate
+
+
+def parse_lots(text):
+    """
+    Convertir un nombre maximal de lots (texte) en entier positif ou nul.
+    :param text:
+    :return lots: None si la valeur est vide ou invalide
+    """
+    try:
+        lots = int(float(text))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return lots if lots >= 0 else None
+
+
+def read_header(reader, file):
+    """
+    Lire l'en-tête d'un fichier CSV et trouver les colonnes des actions (voir COLUMN_MAPPING).
+    :param reader: csv.reader placé au début du fichier
+    :param file: pour les messages d'erreur
+    :return header: noms des colonnes après renommage
+    :return name_index, cost_index, profit_index:
+    :return lots_index: None si la colonne facultative du nombre maximal de lots est absente
+    """
+    header = next(reader, None)
+    if header is None:
+        raise ValueError(f"Fichier vide : {file}")
+    header = [COLUMN_MAPPING.get(column, column) for column in header]
+    missing = [column for column in ('name', 'cost', 'profit') if column not in header]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {file} : {', '.join(missing)}")
+    lots_index = header.index('max_lots') if 'max_lots' in header else None
+    return header, header.index('name'), header.index('cost'), header.index('profit'), lots_index
+
+
+class ActionSet:
+    """
+    Ensemble d'actions stocké en colonnes parallèles : noms, coûts en centimes entiers,
+    bénéfices en décimales et montants des bénéfices en centimes.
+    La colonne facultative max_lots donne le nombre maximal de lots de chaque action (-1 si non précisé).
+    Les algorithmes travaillent sur les indices des actions et ne modifient jamais ces colonnes.
+    """
+    __slots__ = ('names', 'cost_cents', 'profit', 'profit_amount', 'max_lots')
+
+    def __init__(self, names, cost_cents, profit, max_lots=None):
+        self.names = names
+        self.cost_cents = np.asarray(cost_cents, dtype=np.int64)
+        self.profit = np.asarray(profit, dtype=np.float64)
+        self.profit_amount = self.profit * self.cost_cents
+        self.max_lots = None if max_lots is None else np.asarray(max_lots, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.cost_cents)
+
+    @classmethod
+    def from_dataframe(cls, dataframe):
+        """
+        Construire l'ensemble d'actions à partir du résultat de upload_data
+        (les coûts en centimes sont tronqués à l'entier, comme auparavant).
+        :param dataframe:
+        :return actions:
+        """
+        return cls(dataframe['name'].tolist(), dataframe['cost'].to_numpy().astype(np.int64),
+                   dataframe['profit'].to_numpy())
+
+    def subset(self, selection):
+        """
+        :param selection: indices des actions à garder
+        :return actions: nouvel ensemble d'actions, dans l'ordre de selection
+        """
+        return ActionSet([self.names[index] for index in selection], self.cost_cents[selection],
+                         self.profit[selection], None if self.max_lots is None else self.max_lots[selection])
+
+    def selection_cost(self, selection):
+        """
+        :param selection: indices des actions sélectionnées
+        :return cost: coût total en centimes
+        """
+        return int(self.cost_cents[np.asarray(selection, dtype=np.intp)].sum())
+
+    def records(self, selection):
+        """
+        Actions sélectionnées sous forme de dictionnaires, pour l'affichage.
+        :param selection: indices des actions sélectionnées
+        :return records:
+        """
+        return [{'name': self.names[index],
+                 'cost': int(self.cost_cents[index]),
+                 'profit': float(self.profit[index]),
+                 'profit_amount': float(self.profit_amount[index])}
+                for index in selection]
+
+
+def load_actions(file, budget=BUDGET):
+    """
+    Charger et nettoyer les données en une seule lecture, sans pandas.
+    Accepte les deux formats de fichiers (voir COLUMN_MAPPING), applique les mêmes filtres
+    que upload_data et supprime de la même façon toutes les actions dont le nom est en double.
+    Les coûts sont convertis directement en centimes entiers exacts.
+    Un univers déjà converti au format binaire (voir binary_universe.py) est ouvert sans lecture, par open_universe.
+    :param file:
+    :param budget:
+    :return actions: ActionSet
+    """
+    if str(file).endswith(UNIVERSE_SUFFIX):
+        return open_universe(file, budget)
+
+    names = []
+    costs = []
+    rates = []
+    lots = []
+    with instrumentation.phase("load", file=file) as phase, open(file, newline='', encoding='utf-8') as csv_file:
+        reader = csv.reader(csv_file)
+        header, name_index, cost_index, profit_index, lots_index = read_header(reader, file)
+
+        for row in reader:
+            if len(row) < len(header):
+                continue
+            cost = parse_cents(row[cost_index])
+            rate = parse_rate(row[profit_index])
+            # Supprimer les valeurs manquantes, les coûts nuls, négatifs ou hors budget, et les bénéfices négatifs
+            if cost is None or rate is None or not (0 < cost <= budget) or rate <= 0:
+                continue
+            names.append(row[name_index])
+            costs.append(cost)
+            rates.append(rate)
+            if lots_index is not None:
+                row_lots = parse_lots(row[lots_index])
+                lots.append(-1 if row_lots is None else row_lots)
+        # Lignes lues (hors en-tête), compté une seule fois pour ne pas ralentir la boucle
+        phase.count(reader.line_num - 1)
+
+    # Supprimer les doublons (toutes les occurrences, comme duplicated(keep=False))
+    with instrumentation.phase("clean", file=file) as phase:
+        phase.count(len(names))
+        name_counts = {}
+        for name in names:
+            name_counts[name] = name_counts.get(name, 0) + 1
+        kept = [index for index, name in enumerate(names) if name_counts[name] == 1]
+
+    return ActionSet([names[index] for index in kept],
+                     [costs[index] for index in kept],
+                     [rates[index] for index in kept],
+                     [lots[index] for index in kept] if lots_index is not None else None)
+
+
+def open_universe(file, budget=BUDGET):
+    """
+    Ouvrir un univers binaire : les colonnes restent des vues sur le fichier (numpy.memmap).
+    Les actions au-dessus du budget, s'il y en a, sont écartées (ce qui copie les colonnes).
+    Un univers converti avec un budget plus petit que celui demandé est refusé :
+    les actions écartées à la conversion manqueraient au résultat.
+    :param file:
+    :param budget:
+    :return actions: ActionSet
+    """
+    with instrumentation.phase("load", file=file) as phase:
+        names, cost_cents, profit, max_lots, conversion_budget = read_universe(file)
+        if 0 <= conversion_budget < budget:
+            raise ValueError(f"{file} a été converti avec un budget de {conversion_budget / 100:.2f} €, "
+                             f"inférieur au budget demandé ({budget / 100:.2f} €) : le reconvertir")
+        actions = ActionSet(names, cost_cents, profit, max_lots)
+        phase.count(len(actions))
+    if len(actions) and actions.cost_cents.max() > budget:
+        with instrumentation.phase("clean", file=file) as phase:
+            phase.count(len(actions))
+            actions = actions.subset(np.flatnonzero(actions.cost_cents <= budget))
+    return actions
+
+
+def ratios(actions):
+    """
+    Ratio profit/coût de chaque action (0 pour les actions de coût nul).
+    :param actions:
+    :return ratios:
+    """
+    return np.divide(actions.profit_amount, actions.cost_cents,
+                     out=np.zeros(len(actions)), where=actions.cost_cents > 0)
+
+
+def ratio_order(actions):
+    """
+    Indices des actions triées par ratio profit/coût décroissant.
+    Le tri est stable : à ratio égal, l'ordre d'origine est conservé.
+    :param actions:
+    :return order:
+    """
+    return np.argsort(-ratios(actions), kind='stable').tolist()
+
+
 def greedy_best_combination(actions, budget=BUDGET):
     """
     Algorithme glouton qui prend la meilleur combinaison.
@@ -55,17 +324,13 @@ def greedy_best_combination(actions, budget=BUDGET):
     puis sélectionne les actions les plus rentables dans la limite du budget.
     :param actions:
     :param budget:
-    :return best_combination: variable qui contient la meilleure combinaison d'actions
+    :return best_combination: indices des actions de la meilleure combinaison
     :return total_profit: variable qui contient le montant total des bénéfices
     :return total_cost: variable qui contient le montant total d'une sélection d'actions
     :return total_combinations: compte le nombre de combinaisons
     """
-    # Calculer le ratio profit/coût pour chaque action
-    for action in actions:
-        action['ratio'] = (action['profit_amount'] / action['cost']) if action['cost'] > 0 else 0
-
-    # Trier les actions par rapport ratio profit/coût par ordre décroissant
-    actions_sorted = sorted(actions, key=lambda x: x['ratio'], reverse=True)
+    costs = actions.cost_cents.tolist()
+    profits = actions.profit_amount.tolist()
 
     # Initialiser les variables.
     best_combination = []
@@ -73,40 +338,215 @@ def greedy_best_combination(actions, budget=BUDGET):
     total_profit = 0
     total_combinations = 0
 
-    # Ajouter les actions dans la combinaison dans la limite du budget.
-    for action in actions_sorted:
+    # Ajouter les actions, par ratio profit/coût décroissant, dans la limite du budget.
+    for index in ratio_order(actions):
         total_combinations += 1
-        if total_cost + action['cost'] <= budget:
-            best_combination.append(action)
-            total_cost += action['cost']
-            total_profit += action['profit_amount']
+        if total_cost + costs[index] <= budget:
+            best_combination.append(index)
+            total_cost += costs[index]
+            total_profit += profits[index]
 
     return best_combination, total_profit, total_cost, total_combinations
 
 
-def knapsack_best_combination(actions, budget=BUDGET):
+def partial_greedy_selection(actions, budget=BUDGET):
+    """
+    Sélection gloutonne par ratio décroissant sans trier toutes les actions.
+    Les actions sont triées par blocs de taille doublée à chaque fois (np.argpartition) ;
+    on s'arrête dès que le budget restant est inférieur au coût de toutes les actions pas encore examinées.
+    Donne la même sélection que greedy_best_combination (les ex aequo au bord d'un bloc sont pris dans le bloc).
+    :param actions:
+    :param budget:
+    :return best_combination: indices des actions, par ratio décroissant
+    :return total_cost:
+    :return total_combinations: nombre d'actions examinées
+    """
+    costs = actions.cost_cents
+    action_ratios = ratios(actions)
+    remaining_indices = np.arange(len(actions))
+    best_combination = []
+    total_cost = 0
+    total_combinations = 0
+    block_size = 64
+
+    while len(remaining_indices) and budget - total_cost >= costs[remaining_indices].min():
+        remaining_ratios = action_ratios[remaining_indices]
+        if block_size < len(remaining_indices):
+            threshold = np.partition(-remaining_ratios, block_size - 1)[block_size - 1]
+            in_block = -remaining_ratios <= threshold
+        else:
+            in_block = np.ones(len(remaining_indices), dtype=bool)
+        block = remaining_indices[in_block]
+        # Ordre du bloc : ratio décroissant, puis ordre d'origine (comme le tri stable de ratio_order)
+        block = block[np.lexsort((block, -action_ratios[block]))]
+
+        for index in block.tolist():
+            total_combinations += 1
+            if total_cost + costs[index] <= budget:
+                best_combination.append(index)
+                total_cost += int(costs[index])
+        remaining_indices = remaining_indices[~in_block]
+        block_size *= 2
+
+    return best_combination, total_cost, total_combinations
+
+
+def exchange_options(indices, costs, profits):
+    """
+    Ensembles d'au plus deux actions parmi indices (ensemble vide compris), pour la recherche locale.
+    :return members: liste de tuples d'indices
+    :return option_costs:
+    :return option_profits:
+    """
+    members = [()] + [(index,) for index in indices]
+    members += [(first, second) for position, first in enumerate(indices) for second in indices[position + 1:]]
+    option_costs = np.array([sum(costs[index] for index in option) for option in members], dtype=np.int64)
+    option_profits = np.array([sum(profits[index] for index in option) for option in members])
+    return members, option_costs, option_profits
+
+
+def improved_greedy_best_combination(actions, budget=BUDGET):
+    """
+    Glouton amélioré : sélection gloutonne partielle (voir partial_greedy_selection),
+    comparée à la meilleure action seule, ce qui garantit au moins la moitié du profit optimal,
+    puis recherche locale bornée.
+    À chaque étape de la recherche locale, on retire jusqu'à deux actions parmi les LOCAL_SEARCH_SELECTED
+    sélectionnées de plus faible ratio et on ajoute jusqu'à deux actions parmi les LOCAL_SEARCH_CANDIDATES
+    non sélectionnées de meilleur ratio qui pourraient tenir ; on applique le meilleur échange
+    qui respecte le budget et augmente le profit, au plus LOCAL_SEARCH_ITERATIONS fois.
+    :param actions:
+    :param budget:
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return total_profit:
+    :return total_cost:
+    :return total_combinations: actions examinées et échanges évalués
+    """
+    costs = actions.cost_cents.tolist()
+    profits = actions.profit_amount.tolist()
+    best_combination, total_cost, total_combinations = partial_greedy_selection(actions, budget)
+    total_profit = sum(profits[index] for index in best_combination)
+
+    # Garantie d'un facteur 2 : la meilleure action seule si elle rapporte plus
+    affordable = np.flatnonzero((actions.cost_cents > 0) & (actions.cost_cents <= budget))
+    if len(affordable):
+        best_single = int(affordable[np.argmax(actions.profit_amount[affordable])])
+        if profits[best_single] > total_profit:
+            best_combination, total_cost, total_profit = [best_single], costs[best_single], profits[best_single]
+
+    action_ratios = ratios(actions)
+    selected = np.zeros(len(actions), dtype=bool)
+    selected[best_combination] = True
+
+    for _ in range(LOCAL_SEARCH_ITERATIONS):
+        slack = budget - total_cost
+        # Actions retirables : les sélectionnées de plus faible ratio
+        selected_indices = np.flatnonzero(selected)
+        removable = selected_indices[np.argsort(action_ratios[selected_indices], kind='stable')[:LOCAL_SEARCH_SELECTED]]
+        # Actions ajoutables : les meilleurs ratios parmi celles qui tiennent après le plus grand retrait possible
+        largest_removal = int(np.sort(actions.cost_cents[removable])[-2:].sum()) if len(removable) else 0
+        unselected_indices = np.flatnonzero(~selected & (actions.cost_cents > 0)
+                                            & (actions.cost_cents <= slack + largest_removal))
+        addable = unselected_indices[np.argsort(-action_ratios[unselected_indices], kind='stable')[:LOCAL_SEARCH_CANDIDATES]]
+        if not len(addable):
+            break
+
+        removals, removal_costs, removal_profits = exchange_options(removable.tolist(), costs, profits)
+        additions, addition_costs, addition_profits = exchange_options(addable.tolist(), costs, profits)
+        # Gain de chaque échange (retrait, ajout) ; les échanges hors budget sont exclus
+        gains = addition_profits[np.newaxis, :] - removal_profits[:, np.newaxis]
+        feasible = addition_costs[np.newaxis, :] - removal_costs[:, np.newaxis] <= slack
+        gains[~feasible] = -np.inf
+        total_combinations += gains.size
+
+        removal, addition = np.unravel_index(np.argmax(gains), gains.shape)
+        if gains[removal, addition] <= 1e-9:
+            break
+        selected[list(removals[removal])] = False
+        selected[list(additions[addition])] = True
+        total_cost += int(addition_costs[addition] - removal_costs[removal])
+        total_profit += float(gains[removal, addition])
+
+    best_combination = [index for index in best_combination if selected[index]]
+    best_combination += sorted(set(np.flatnonzero(selected).tolist()) - set(best_combination))
+    return best_combination, total_profit, total_cost, total_combinations
+
+
+def cost_resolution(actions, budget=BUDGET):
+    """
+    Trouver l'unité de coût la plus grossière qui représente exactement tous les coûts :
+    le PGCD des coûts entiers (en centimes) des actions qui tiennent dans le budget.
+    Par exemple, des prix tous en euros entiers donnent une unité d'au moins 100 centimes.
+    :param actions:
+    :param budget:
+    :return unit: unité de coût en centimes (1 si aucune simplification n'est possible)
+    """
+    costs = actions.cost_cents[(actions.cost_cents > 0) & (actions.cost_cents <= budget)]
+    unit = int(np.gcd.reduce(costs)) if costs.size else 0
+    return unit or 1
+
+
+def scale_costs(actions, unit):
+    """
+    Convertir les coûts entiers dans l'unité donnée.
+    Les coûts multiples de l'unité sont exacts ; les autres (actions plus chères que le budget)
+    sont arrondis au supérieur pour rester hors budget.
+    :param actions:
+    :param unit:
+    :return costs: liste des coûts dans l'unité
+    """
+    return (-(-actions.cost_cents // unit)).tolist()
+
+
+def knapsack_best_combination(actions, budget=BUDGET, backend=KNAPSACK_BACKEND, scale=True):
     """
     Algorithme sac à dos qui sélectionne la meilleure combinaison d'actions maximisant le profit
     sans dépasser le budget.
+    Le tableau est construit à la résolution la plus grossière qui représente exactement tous les coûts
+    (voir cost_resolution), ce qui réduit le temps et la mémoire sans changer le résultat.
     :param actions:
     :param budget:
-    :return selected_actions[budget]:
+    :param backend: "python" pour la boucle de référence, "numpy" pour le calcul vectorisé,
+                    "hirschberg" pour le calcul vectorisé en mémoire linéaire, "pareto" pour la liste
+                    des états non dominés, "auto" pour choisir entre "pareto" et "numpy"
+    :param scale: False pour forcer le calcul au centime près
+    :return best_combination: indices des actions de la meilleure combinaison
     :return max_profit_for_budget[budget]:
     :return total_combinations: compte le nombre de combinaisons
     """
+    if backend == "pareto":
+        return pareto_best_combination(actions, budget)
+    unit = cost_resolution(actions, budget) if scale else 1
+    if backend == "auto":
+        cells = len(actions) * (budget // unit + 1)
+        if pareto_is_small(actions, budget, cells):
+            # Si l'estimation s'est nettement trompée, abandonner quand la liste coûte bien plus que le tableau
+            solution = pareto_best_combination(actions, budget, PARETO_ABORT_FACTOR * cells // PARETO_STATE_COST)
+            if solution is not None:
+                return solution
+        backend = "numpy"
+    if backend == "numpy":
+        return knapsack_best_combination_numpy(actions, budget, unit)
+    if backend == "hirschberg":
+        return knapsack_best_combination_hirschberg(actions, budget, unit)
+    if backend != "python":
+        raise ValueError(f"Moteur de calcul inconnu : {backend}")
+
+    # Exprimer les coûts et le budget dans l'unité de coût
+    costs = scale_costs(actions, unit)
+    profits = actions.profit_amount.tolist()
+    budget //= unit
+
     # Créer un tableau pour stocker le meilleur profit pour chaque budget (de 0 à 50000). Commence à 0 d'où le + 1
     max_profit_for_budget = [0] * (budget + 1)
 
-    # Créer un tableau pour stocker les actions sélectionnées pour chaque budget (Ex : selected_actions = [
-    #     #[],  # Indice 0 : budget de 0 centime
-    #     #[],  # Indice 1 : budget de 1 centime...
-    selected_actions = [[] for _ in range(budget + 1)]
+    # Créer une matrice de décisions : pour chaque action, un bit par niveau de budget indique
+    # si l'action a été prise pour atteindre le profit maximal à ce niveau (n * (budget + 1) / 8 octets)
+    decisions = []
     total_combinations = 0
 
-    # Parcourir chaque action de la liste actions et récupérer le coût et le profit
-    for action in actions:
-        cost = int(action['cost'])
-        profit = action['profit_amount']
+    # Parcourir chaque action et récupérer le coût et le profit
+    for cost, profit in zip(costs, profits):
+        taken = bytearray(budget // 8 + 1)
 
         # Parcourir le tableau pour trouver le meilleur profit pour chaque budget
         # Start = budget, stop = cost-1 (sinon coût exclus), step = -1
@@ -116,13 +556,945 @@ def knapsack_best_combination(actions, budget=BUDGET):
             if max_profit_for_budget[budget_level - cost] + profit > max_profit_for_budget[budget_level]:
                 # Mettre à jour le profit maximal pour ce niveau de budget en incluant cette action
                 max_profit_for_budget[budget_level] = max_profit_for_budget[budget_level - cost] + profit
-                # Mettre à jour la liste d'actions sélectionnées pour atteindre ce profit maximal à ce niveau de budget
-                selected_actions[budget_level] = selected_actions[budget_level - cost] + [action]
+                # Mémoriser que l'action est prise à ce niveau de budget
+                taken[budget_level >> 3] |= 1 << (budget_level & 7)
+
+        decisions.append(taken)
+
+    best_combination = instrumented_reconstruction(costs, decisions, budget)
+    return best_combination, max_profit_for_budget[budget], total_combinations
+
+
+def knapsack_best_combination_numpy(actions, budget=BUDGET, unit=1):
+    """
+    Version vectorisée de l'algorithme sac à dos.
+    Chaque action est traitée en une seule opération sur toute la ligne max_profit_for_budget :
+    la ligne décalée du coût de l'action, augmentée de son profit, est comparée à la ligne actuelle.
+    Retourne exactement la même sélection et le même profit que la boucle de référence.
+    :param actions:
+    :param budget:
+    :param unit: unité de coût en centimes (voir cost_resolution)
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return max_profit_for_budget[budget]:
+    :return total_combinations: compte le nombre de combinaisons
+    """
+    costs = scale_costs(actions, unit)
+    budget //= unit
+    max_profit_for_budget, decisions, total_combinations = knapsack_table(costs, actions.profit_amount.tolist(), budget)
+    best_combination = instrumented_reconstruction(costs, decisions, budget)
+    return best_combination, float(max_profit_for_budget[budget]), total_combinations
+
+
+def pareto_is_small(actions, budget, cells):
+    """
+    Prévoir, avant le calcul, si la liste des états non dominés coûtera moins que le tableau numpy.
+    Les petits tableaux (moins de PARETO_MIN_CELLS cases) sont toujours calculés par numpy.
+    Sinon, le nombre d'états fusionnés pour les PARETO_PROBE_ACTIONS premières actions est extrapolé
+    à toutes les actions (croissance quadratique, bornée par la taille du tableau).
+    :param actions:
+    :param budget:
+    :param cells: taille du tableau de programmation dynamique (actions x niveaux de budget)
+    :return small:
+    """
+    if cells <= PARETO_MIN_CELLS:
+        return False
+    probe = min(len(actions), PARETO_PROBE_ACTIONS)
+    _, _, probe_combinations = pareto_best_combination(actions.subset(list(range(probe))), budget)
+    estimate = min(probe_combinations * (len(actions) / probe) ** 2, cells)
+    return estimate * PARETO_STATE_COST < cells
+
+
+def pareto_best_combination(actions, budget=BUDGET, max_combinations=None):
+    """
+    Algorithme sac à dos sur la liste des états non dominés (Nemhauser et Ullmann).
+    Un état est un couple (coût, profit) atteignable ; il est dominé si un autre état coûte au plus autant
+    et rapporte au moins autant. Les états non dominés sont gardés dans deux tableaux triés par coût
+    (les profits sont alors croissants). Pour chaque action, la liste décalée du coût et du profit
+    de l'action est fusionnée avec la liste actuelle, puis les états dominés sont retirés.
+    Le temps et la mémoire dépendent du nombre d'états non dominés, pas de la résolution du budget :
+    les coûts n'ont pas besoin d'être regroupés par cost_resolution.
+    :param actions:
+    :param budget:
+    :param max_combinations: abandonner (retourner None) si le nombre d'états fusionnés dépasse cette limite
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return best_profit:
+    :return total_combinations: nombre d'états fusionnés
+    """
+    costs = actions.cost_cents.tolist()
+    profits = actions.profit_amount.tolist()
+    state_costs = np.zeros(1, dtype=np.int64)
+    state_profits = np.zeros(1)
+    # Pour chaque action : état d'origine et action prise ou non, pour chaque état de la liste suivante
+    origins = []
+    total_combinations = 0
+
+    for cost, profit in zip(costs, profits):
+        if not 0 < cost <= budget or profit <= 0:
+            origins.append(None)
+            continue
+        # Les états qui peuvent encore recevoir l'action forment un préfixe de la liste
+        count = len(state_costs)
+        reachable = int(np.searchsorted(state_costs, budget - cost, side='right'))
+        merged_costs = np.concatenate((state_costs, state_costs[:reachable] + cost))
+        merged_profits = np.concatenate((state_profits, state_profits[:reachable] + profit))
+        merged_origins = np.concatenate((np.arange(count), np.arange(reachable)))
+        # Deux listes déjà triées : le tri stable (par fusion) est linéaire
+        order = np.argsort(merged_costs, kind='stable')
+        merged_costs, merged_profits, merged_origins = merged_costs[order], merged_profits[order], merged_origins[order]
+        taken = order >= count
+        total_combinations += len(order)
+
+        # Retirer les états dont le profit ne dépasse pas celui d'un état moins cher,
+        # puis, à coût égal, garder le dernier (le plus rentable)
+        best_before = np.maximum.accumulate(merged_profits)
+        kept = np.ones(len(order), dtype=bool)
+        kept[1:] = merged_profits[1:] > best_before[:-1]
+        merged_costs, merged_profits = merged_costs[kept], merged_profits[kept]
+        merged_origins, taken = merged_origins[kept], taken[kept]
+        kept = np.ones(len(merged_costs), dtype=bool)
+        kept[:-1] = merged_costs[:-1] != merged_costs[1:]
+
+        state_costs, state_profits = merged_costs[kept], merged_profits[kept]
+        origins.append((merged_origins[kept], taken[kept]))
+        if max_combinations is not None and total_combinations > max_combinations:
+            return None
+
+    # Le dernier état est le plus rentable ; on remonte ses origines
+    best_combination = []
+    state = len(state_costs) - 1
+    best_profit = float(state_profits[state])
+    with instrumentation.phase("reconstruct") as phase:
+        phase.count(len(origins))
+        for index in range(len(origins) - 1, -1, -1):
+            if origins[index] is None:
+                continue
+            state_origins, state_taken = origins[index]
+            if state_taken[state]:
+                best_combination.append(index)
+            state = int(state_origins[state])
+    best_combination.reverse()
+    return best_combination, best_profit, total_combinations
+
+
+def add_action_to_row(row, cost, profit):
+    """
+    Ajouter une action à une ligne de programmation dynamique (meilleur profit pour chaque niveau de budget).
+    :param row: ligne de budget + 1 cases, modifiée sur place
+    :param cost: coût entier
+    :param profit:
+    """
+    budget = len(row) - 1
+    if cost <= budget:
+        np.maximum(row[cost:], row[:budget + 1 - cost] + profit, out=row[cost:])
+
+
+def knapsack_row(costs, profits, budget):
+    """
+    Dernière ligne de la programmation dynamique, sans matrice de décisions : une seule ligne en mémoire.
+    :param costs: coûts entiers
+    :param profits:
+    :param budget:
+    :return max_profit_for_budget: meilleur profit pour chaque niveau de budget de 0 à budget
+    """
+    max_profit_for_budget = np.zeros(budget + 1)
+    for cost, profit in zip(costs, profits):
+        add_action_to_row(max_profit_for_budget, cost, profit)
+    return max_profit_for_budget
+
+
+def hirschberg_combination(costs, profits, budget):
+    """
+    Meilleure combinaison en mémoire linéaire, par division (Hirschberg).
+    Les actions sont coupées en deux moitiés ; la ligne de la première moitié (lue de gauche à droite)
+    et celle de la seconde donnent le meilleur partage du budget entre les deux : argmax de
+    avant[b] + après[budget - b]. Chaque moitié est ensuite résolue avec sa part du budget.
+    Les petits sous-problèmes sont terminés avec la matrice de décisions (knapsack_table).
+    Le meilleur partage donne aussi le profit optimal : aucune passe séparée n'est nécessaire.
+    :param costs: coûts entiers
+    :param profits:
+    :param budget:
+    :return best_combination: indices des actions sélectionnées, par ordre croissant
+    :return best_profit:
+    :return total_combinations: cases calculées, sous-problèmes compris
+    """
+    if len(costs) * (budget + 1) <= HIRSCHBERG_BASE_CELLS or len(costs) == 1:
+        max_profit_for_budget, decisions, total_combinations = knapsack_table(costs, profits, budget)
+        return (reconstruct_combination(costs, decisions, budget), float(max_profit_for_budget[budget]),
+                total_combinations)
+
+    middle = len(costs) // 2
+    first_row = knapsack_row(costs[:middle], profits[:middle], budget)
+    second_row = knapsack_row(costs[middle:], profits[middle:], budget)
+    split_profits = first_row + second_row[::-1]
+    first_budget = int(np.argmax(split_profits))
+    total_combinations = sum(budget - cost + 1 for cost in costs if cost <= budget)
+
+    first_half, _, first_combinations = hirschberg_combination(costs[:middle], profits[:middle], first_budget)
+    second_half, _, second_combinations = hirschberg_combination(costs[middle:], profits[middle:],
+                                                                 budget - first_budget)
+    return (first_half + [middle + index for index in second_half], float(split_profits[first_budget]),
+            total_combinations + first_combinations + second_combinations)
+
 
-    return selected_actions[budget], max_profit_for_budget[budget], total_combinations
+def knapsack_best_combination_hirschberg(actions, budget=BUDGET, unit=1):
+    """
+    Version en mémoire linéaire de l'algorithme sac à dos : la combinaison et le profit optimal sont trouvés
+    par division (voir hirschberg_combination), sans matrice de décisions n x budget.
+    Mémoire proportionnelle au budget, temps d'environ deux passes.
+    :param actions:
+    :param budget:
+    :param unit: unité de coût en centimes (voir cost_resolution)
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return max_profit_for_budget[budget]:
+    :return total_combinations: cases calculées, reconstruction comprise
+    """
+    costs = scale_costs(actions, unit)
+    profits = actions.profit_amount.tolist()
+    budget //= unit
+    with instrumentation.phase("reconstruct") as phase:
+        best_combination, best_profit, total_combinations = hirschberg_combination(costs, profits, budget)
+        phase.count(total_combinations)
+    return best_combination, best_profit, total_combinations
+
+
+def knapsack_table(costs, profits, budget):
+    """
+    Passe vectorisée de la programmation dynamique.
+    :param costs: coûts entiers
+    :param profits:
+    :param budget:
+    :return max_profit_for_budget: meilleur profit pour chaque niveau de budget de 0 à budget
+    :return decisions: un bit par action et par niveau de budget (1 = action prise)
+    :return total_combinations:
+    """
+    max_profit_for_budget = np.zeros(budget + 1)
+    # Matrice de décisions compactée : un bit par action et par niveau de budget
+    decisions = np.zeros((len(costs), budget // 8 + 1), dtype=np.uint8)
+    total_combinations = 0
+
+    for index, (cost, profit) in enumerate(zip(costs, profits)):
+        if cost > budget:
+            continue
+        total_combinations += budget - cost + 1
+
+        # Profit obtenu en ajoutant l'action à chaque niveau de budget (calculé sur la ligne avant mise à jour)
+        candidate_profit = max_profit_for_budget[:budget + 1 - cost] + profit
+        improved = candidate_profit > max_profit_for_budget[cost:]
+        max_profit_for_budget[cost:][improved] = candidate_profit[improved]
+
+        # Mémoriser les niveaux de budget où l'action est prise
+        taken = np.zeros(budget + 1, dtype=bool)
+        taken[cost:] = improved
+        decisions[index] = np.packbits(taken, bitorder='little')
+
+    return max_profit_for_budget, decisions, total_combinations
+
+
+def reconstruct_combination(costs, decisions, budget=BUDGET):
+    """
+    Reconstruire la meilleure combinaison en remontant la matrice de décisions,
+    de la dernière action à la première.
+    :param costs: coûts entiers utilisés par la programmation dynamique
+    :param decisions: un bit par action et par niveau de budget (1 = action prise)
+    :param budget:
+    :return best_combination: indices des actions sélectionnées, par ordre croissant
+    """
+    best_combination = []
+    budget_level = budget
+    for index in range(len(costs) - 1, -1, -1):
+        if (decisions[index][budget_level >> 3] >> (budget_level & 7)) & 1:
+            best_combination.append(index)
+            budget_level -= costs[index]
+    best_combination.reverse()
+    return best_combination
+
+
+def instrumented_reconstruction(costs, decisions, budget=BUDGET):
+    """
+    reconstruct_combination mesurée comme phase "reconstruct" (une opération par action remontée).
+    """
+    with instrumentation.phase("reconstruct") as phase:
+        phase.count(len(costs))
+        return reconstruct_combination(costs, decisions, budget)
+
+
+class BudgetFrontier:
+    """
+    Frontière efficiente issue d'une seule passe de programmation dynamique :
+    le meilleur profit pour chaque budget de 0 au budget maximal, et la combinaison
+    correspondante, reconstruite à la demande pour n'importe quel budget.
+    """
+    __slots__ = ('unit', 'costs', 'max_profit_for_budget', 'decisions', 'total_combinations')
+
+    def __init__(self, unit, costs, max_profit_for_budget, decisions, total_combinations):
+        self.unit = unit
+        self.costs = costs
+        self.max_profit_for_budget = max_profit_for_budget
+        self.decisions = decisions
+        self.total_combinations = total_combinations
+
+    @property
+    def max_budget(self):
+        return (len(self.max_profit_for_budget) - 1) * self.unit
+
+    def budgets(self):
+        """
+        :return budgets: niveaux de budget (en centimes) couverts par la frontière
+        """
+        return np.arange(len(self.max_profit_for_budget)) * self.unit
+
+    def profit(self, budget):
+        """
+        :param budget: budget en centimes, au plus max_budget
+        :return best_profit:
+        """
+        return float(self.max_profit_for_budget[budget // self.unit])
+
+    def combination(self, budget):
+        """
+        :param budget: budget en centimes, au plus max_budget
+        :return best_combination: indices des actions de la meilleure combinaison pour ce budget
+        """
+        return reconstruct_combination(self.costs, self.decisions, budget // self.unit)
+
+
+def knapsack_frontier(actions, budget=BUDGET):
+    """
+    Calculer la frontière budget -> profit optimal en une seule passe, jusqu'au budget donné.
+    :param actions:
+    :param budget: budget maximal en centimes
+    :return frontier: BudgetFrontier
+    """
+    unit = cost_resolution(actions, budget)
+    costs = scale_costs(actions, unit)
+    max_profit_for_budget, decisions, total_combinations = knapsack_table(
+        costs, actions.profit_amount.tolist(), budget // unit)
+    return BudgetFrontier(unit, costs, max_profit_for_budget, decisions, total_combinations)
+
+
+def dantzig_bound(actions, budget=BUDGET):
+    """
+    Borne supérieure de Dantzig (relaxation fractionnaire) : les actions sont prises entièrement
+    par ratio profit/coût décroissant, puis une fraction de la première qui ne tient plus.
+    Aucune combinaison ne peut dépasser cette borne.
+    :param actions:
+    :param budget:
+    :return upper_bound:
+    """
+    order = ratio_order(actions)
+    costs = actions.cost_cents[order]
+    profits = actions.profit_amount[order]
+    cumulative_costs = np.cumsum(costs)
+    break_index = int(np.searchsorted(cumulative_costs, budget, side='right'))
+    upper_bound = float(profits[:break_index].sum())
+    if break_index < len(order):
+        used = cumulative_costs[break_index - 1] if break_index else 0
+        upper_bound += (budget - used) * profits[break_index] / costs[break_index]
+    return upper_bound
 
 
-def display_results(algorithm_name, execution_time, best_combination, best_profit, best_combination_cost, total_combinations):
+def min_cost_table(costs, profits, max_profit):
+    """
+    Passe vectorisée de la programmation dynamique « par profit » :
+    coût minimal pour atteindre exactement chaque profit entier de 0 à max_profit.
+    :param costs: coûts en centimes
+    :param profits: profits entiers (mis à l'échelle)
+    :param max_profit:
+    :return min_cost_for_profit: coût minimal pour chaque profit (infini si le profit est inaccessible)
+    :return decisions: un bit par action et par profit (1 = action prise)
+    :return total_combinations:
+    """
+    min_cost_for_profit = np.full(max_profit + 1, np.inf)
+    min_cost_for_profit[0] = 0
+    decisions = np.zeros((len(costs), max_profit // 8 + 1), dtype=np.uint8)
+    total_combinations = 0
+
+    for index, (cost, profit) in enumerate(zip(costs, profits)):
+        if profit <= 0 or profit > max_profit:
+            continue
+        total_combinations += max_profit - profit + 1
+
+        # Coût obtenu en ajoutant l'action à chaque profit (calculé sur la ligne avant mise à jour)
+        candidate_cost = min_cost_for_profit[:max_profit + 1 - profit] + cost
+        improved = candidate_cost < min_cost_for_profit[profit:]
+        min_cost_for_profit[profit:][improved] = candidate_cost[improved]
+
+        taken = np.zeros(max_profit + 1, dtype=bool)
+        taken[profit:] = improved
+        decisions[index] = np.packbits(taken, bitorder='little')
+
+    return min_cost_for_profit, decisions, total_combinations
+
+
+def lot_caps(actions, max_lots=MAX_LOTS):
+    """
+    Nombre maximal de lots de chaque action : celui du fichier, sinon max_lots.
+    :param actions:
+    :param max_lots: valeur par défaut
+    :return caps:
+    """
+    caps = np.full(len(actions), max_lots, dtype=np.int64)
+    if actions.max_lots is not None:
+        caps = np.where(actions.max_lots >= 0, actions.max_lots, caps)
+    return caps
+
+
+def bounded_knapsack_best_combination(actions, budget=BUDGET, max_lots=MAX_LOTS):
+    """
+    Sac à dos borné : chaque action peut être achetée en plusieurs lots, dans la limite de son plafond
+    (voir lot_caps). Par découpage binaire, une action plafonnée à k lots devient des paquets
+    de 1, 2, 4... lots et un reste, soit environ log2(k) objets au lieu de k : toute quantité de 0 à k
+    s'obtient avec une seule combinaison de paquets. La programmation dynamique 0/1 vectorisée
+    s'applique ensuite aux paquets.
+    :param actions:
+    :param budget:
+    :param max_lots: plafond des actions pour lesquelles le fichier n'en donne pas
+    :return best_quantities: liste de (indice de l'action, nombre de lots), par indice croissant
+    :return best_profit:
+    :return total_combinations:
+    """
+    costs = actions.cost_cents.tolist()
+    profits = actions.profit_amount.tolist()
+    caps = lot_caps(actions, max_lots).tolist()
+
+    # Paquets du découpage binaire : (indice de l'action, nombre de lots)
+    packets = []
+    for index, (cost, cap) in enumerate(zip(costs, caps)):
+        if cost <= 0:
+            continue
+        # Inutile de prévoir plus de lots que le budget ne permet d'en acheter
+        remaining = min(cap, budget // cost)
+        size = 1
+        while remaining > 0:
+            packets.append((index, min(size, remaining)))
+            remaining -= size
+            size *= 2
+
+    packet_costs = [costs[index] * size for index, size in packets]
+    unit = gcd(*packet_costs, budget) if packet_costs else 1
+    scaled_costs = [cost // unit for cost in packet_costs]
+    max_profit_for_budget, decisions, total_combinations = knapsack_table(
+        scaled_costs, [profits[index] * size for index, size in packets], budget // unit)
+    selection = instrumented_reconstruction(scaled_costs, decisions, budget // unit)
+
+    quantities = {}
+    for packet in selection:
+        index, size = packets[packet]
+        quantities[index] = quantities.get(index, 0) + size
+    return sorted(quantities.items()), float(max_profit_for_budget[budget // unit]), total_combinations
+
+
+def fptas_best_combination(actions, budget=BUDGET, epsilon=FPTAS_EPSILON):
+    """
+    Schéma d'approximation entièrement polynomial (FPTAS).
+    LB = max(profit glouton, meilleure action seule) vérifie LB <= optimum <= 2 * LB.
+    Les profits sont divisés par K = epsilon * LB / n et arrondis à l'entier inférieur, puis une programmation
+    dynamique calcule le coût minimal de chaque profit mis à l'échelle. Le tableau a au plus 2n/epsilon colonnes :
+    sa taille dépend de n et d'epsilon, pas du budget.
+    L'arrondi perd au plus K par action, donc au plus epsilon * LB au total :
+    le profit obtenu est au moins (1 - epsilon) fois le profit optimal.
+    :param actions:
+    :param budget:
+    :param epsilon: perte relative maximale, entre 0 et 1 (plus petit = plus précis et plus lent)
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return best_profit:
+    :return upper_bound: borne garantie, aucune combinaison ne dépasse ce profit
+    :return total_combinations:
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError(f"epsilon doit être strictement compris entre 0 et 1 : {epsilon}")
+
+    costs = actions.cost_cents.tolist()
+    profits = actions.profit_amount.tolist()
+    candidates = [index for index in range(len(costs)) if 0 < costs[index] <= budget and profits[index] > 0]
+    if not candidates:
+        return [], 0, 0, 0
+
+    # Solution de départ : la meilleure entre la solution gloutonne et la meilleure action seule
+    best_combination, best_profit, _, _ = greedy_best_combination(actions, budget)
+    best_single = max(candidates, key=lambda index: profits[index])
+    if profits[best_single] > best_profit:
+        best_combination, best_profit = [best_single], profits[best_single]
+    lower_bound = best_profit
+
+    scale = epsilon * lower_bound / len(candidates)
+    scaled_profits = [int(profits[index] // scale) for index in candidates]
+    # Le profit optimal vaut au plus 2 * LB, soit 2n/epsilon une fois mis à l'échelle
+    max_profit = ceil(2 * len(candidates) / epsilon)
+    min_cost_for_profit, decisions, total_combinations = min_cost_table(
+        [costs[index] for index in candidates], scaled_profits, max_profit)
+
+    # Plus grand profit mis à l'échelle atteignable dans le budget, puis remontée des décisions
+    reachable_profit = int(np.flatnonzero(min_cost_for_profit <= budget)[-1])
+    combination = [candidates[index]
+                   for index in reconstruct_combination(scaled_profits, decisions, reachable_profit)]
+    profit = float(actions.profit_amount[combination].sum())
+    if profit > best_profit:
+        best_combination, best_profit = combination, profit
+
+    # optimum <= profit + epsilon * LB, et jamais au-delà de la relaxation fractionnaire
+    upper_bound = min(profit + epsilon * lower_bound, dantzig_bound(actions, budget))
+    return best_combination, best_profit, max(upper_bound, best_profit), total_combinations
+
+
+def ratio_candidates(actions, budget=BUDGET):
+    """
+    Actions qui tiennent dans le budget, par ratio profit/coût décroissant.
+    :param actions:
+    :param budget:
+    :return candidates: indices des actions
+    :return costs:
+    :return profits:
+    """
+    all_costs = actions.cost_cents.tolist()
+    candidates = [index for index in ratio_order(actions) if 0 < all_costs[index] <= budget]
+    return candidates, [all_costs[index] for index in candidates], actions.profit_amount[candidates].tolist()
+
+
+def depth_first_search(costs, profits, budget, best_profit, max_positions=None, extra_bound=None):
+    """
+    Exploration en profondeur de la séparation et évaluation, branche « avec l'action » d'abord.
+    Une branche est abandonnée dès que sa borne supérieure (relaxation fractionnaire de Dantzig,
+    éventuellement réduite par extra_bound) ne dépasse pas la meilleure solution connue.
+    :param costs: coûts des actions triées par ratio décroissant, toutes dans le budget
+    :param profits:
+    :param budget:
+    :param best_profit: profit de la meilleure solution connue
+    :param max_positions: nombre maximal d'actions (None pour aucune limite)
+    :param extra_bound: fonction (indice, positions libres) -> borne du profit des actions à partir de l'indice,
+                        None pour n'utiliser que la borne de Dantzig
+    :return best_path: positions dans costs de la meilleure combinaison, None si aucune ne dépasse best_profit
+    :return best_profit:
+    :return total_combinations: nombre de noeuds explorés
+    """
+    number_of_actions = len(costs)
+    if max_positions is None:
+        max_positions = number_of_actions
+
+    # Sommes cumulées pour trouver l'action de rupture de la borne de Dantzig par recherche dichotomique
+    cumulative_costs = list(accumulate(costs, initial=0))
+    cumulative_profits = list(accumulate(profits, initial=0))
+
+    best_path = None
+    total_combinations = 0
+
+    # Pile des branches « sans l'action » restant à explorer : (indice, coût, profit, profondeur du chemin)
+    stack = [(0, 0, 0, 0)]
+    path = []
+    while stack:
+        index, cost, profit, depth = stack.pop()
+        del path[depth:]
+
+        while index < number_of_actions and len(path) < max_positions:
+            total_combinations += 1
+
+            # Borne supérieure : actions entières tant qu'elles tiennent, puis fraction de l'action de rupture
+            remaining = budget - cost
+            break_index = bisect_right(cumulative_costs, cumulative_costs[index] + remaining) - 1
+            upper_bound = profit + cumulative_profits[break_index] - cumulative_profits[index]
+            if break_index < number_of_actions:
+                used = cumulative_costs[break_index] - cumulative_costs[index]
+                upper_bound += (remaining - used) * profits[break_index] / costs[break_index]
+            if extra_bound is not None:
+                upper_bound = min(upper_bound, profit + extra_bound(index, max_positions - len(path)))
+            if upper_bound <= best_profit:
+                break
+
+            if costs[index] <= remaining:
+                # Explorer d'abord la branche « avec l'action », garder l'autre pour plus tard
+                stack.append((index + 1, cost, profit, len(path)))
+                path.append(index)
+                cost += costs[index]
+                profit += profits[index]
+                if profit > best_profit:
+                    best_profit = profit
+                    best_path = list(path)
+            index += 1
+
+    return best_path, best_profit, total_combinations
+
+
+def branch_and_bound_best_combination(actions, budget=BUDGET):
+    """
+    Algorithme exact par séparation et évaluation (branch and bound).
+    Les actions sont triées par ratio profit/coût décroissant, comme dans l'algorithme glouton,
+    puis explorées en profondeur (voir depth_first_search). Une branche est abandonnée dès que sa borne
+    supérieure (relaxation fractionnaire de Dantzig) ne dépasse pas la meilleure solution connue,
+    initialisée avec le résultat de l'algorithme glouton.
+    Le temps de calcul et la mémoire ne dépendent pas de la taille du budget.
+    :param actions:
+    :param budget:
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return best_profit:
+    :return total_combinations: nombre de noeuds explorés
+    """
+    # Point de départ : la solution gloutonne
+    best_combination, best_profit, _, _ = greedy_best_combination(actions, budget)
+
+    candidates, costs, profits = ratio_candidates(actions, budget)
+    best_path, best_profit, total_combinations = depth_first_search(costs, profits, budget, best_profit)
+    if best_path is not None:
+        best_combination = [candidates[index] for index in best_path]
+
+    return best_combination, best_profit, total_combinations
+
+
+def reduce_to_core(actions, budget=BUDGET):
+    """
+    Réduire le problème à son noyau avant la résolution exacte.
+    1. Fixation par bornes (Dembo et Hammer) : avec r le ratio de l'action de rupture de la solution gloutonne
+       et U la borne de Dantzig, forcer une action à l'inverse de la relaxation fractionnaire
+       fait perdre au moins |profit - r * coût| à la borne. Si U - |profit - r * coût| est sous la meilleure
+       solution connue, l'action est fixée : prise si son ratio dépasse r, écartée sinon.
+    2. Actions dominées (plus chères et moins rentables qu'une autre) : une action n'est retirée que si elle
+       est dominée par au moins K actions gardées, K étant le nombre maximal d'actions du noyau qui tiennent
+       dans le budget restant. Toute combinaison qui la contient peut alors l'échanger contre une action
+       dominante libre, sans perdre de profit.
+    :param actions:
+    :param budget:
+    :return fixed: indices des actions fixées dans la combinaison
+    :return core: indices des actions restant à décider
+    :return incumbent: meilleure solution connue (indices, profit), celle du glouton amélioré
+    """
+    incumbent, incumbent_profit, _, _ = improved_greedy_best_combination(actions, budget)
+    costs = actions.cost_cents
+    profits = actions.profit_amount
+    affordable = (costs > 0) & (costs <= budget)
+
+    order = np.array(ratio_order(actions), dtype=np.int64)
+    order = order[affordable[order]]
+    break_position = int(np.searchsorted(np.cumsum(costs[order]), budget, side='right'))
+    if break_position == len(order):
+        # Toutes les actions tiennent ensemble dans le budget
+        return order.tolist(), [], (incumbent, incumbent_profit)
+
+    break_index = order[break_position]
+    break_ratio = profits[break_index] / costs[break_index]
+    upper_bound = dantzig_bound(actions.subset(order), budget)
+    reduced_profits = profits - break_ratio * costs
+    fixable = affordable & (upper_bound - np.abs(reduced_profits) < incumbent_profit - CORE_TOLERANCE)
+    fixed = np.flatnonzero(fixable & (reduced_profits > 0)).tolist()
+    candidates = np.flatnonzero(affordable & ~fixable)
+
+    # Actions dominées, parcourues par coût croissant (puis profit décroissant, puis ordre d'origine)
+    remaining_budget = budget - int(costs[fixed].sum())
+    if remaining_budget < 0:
+        # Aucune combinaison ne contient toutes les actions fixées : la solution connue est optimale
+        return [], [], (incumbent, incumbent_profit)
+    sorted_costs = np.sort(costs[candidates])
+    max_cardinality = int(np.searchsorted(np.cumsum(sorted_costs), remaining_budget, side='right'))
+
+    core = []
+    kept_profits = []  # Tas des max_cardinality plus grands profits gardés jusqu'ici
+    for index in candidates[np.lexsort((candidates, -profits[candidates], costs[candidates]))].tolist():
+        if costs[index] > remaining_budget:
+            continue
+        if max_cardinality and len(kept_profits) >= max_cardinality and kept_profits[0] >= profits[index]:
+            continue
+        core.append(index)
+        if len(kept_profits) < max_cardinality:
+            heappush(kept_profits, profits[index])
+        elif max_cardinality:
+            heappushpop(kept_profits, profits[index])
+
+    return fixed, sorted(core), (incumbent, incumbent_profit)
+
+
+def core_best_combination(actions, budget=BUDGET, solver=None):
+    """
+    Résolution exacte sur le noyau (voir reduce_to_core) : les actions fixées sont ajoutées au résultat,
+    qui est comparé à la meilleure solution connue.
+    :param actions:
+    :param budget:
+    :param solver: algorithme exact appliqué au noyau (programmation dynamique par défaut)
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return best_profit:
+    :return eliminated_actions: nombre d'actions retirées du problème (fixées ou écartées)
+    :return total_combinations:
+    """
+    solver = solver or knapsack_best_combination
+    fixed, core, (best_combination, best_profit) = reduce_to_core(actions, budget)
+    eliminated_actions = len(actions) - len(core)
+
+    total_combinations = 0
+    remaining_budget = budget - actions.selection_cost(fixed)
+    if remaining_budget >= 0:
+        solution = solver(actions.subset(core), remaining_budget)
+        total_combinations = solution[-1]
+        combination = sorted(fixed + [core[index] for index in solution[0]])
+        profit = float(actions.profit_amount[combination].sum())
+        if profit > best_profit:
+            best_combination, best_profit = combination, profit
+
+    return best_combination, best_profit, eliminated_actions, total_combinations
+
+
+def cardinality_knapsack_table(costs, profits, budget, max_positions):
+    """
+    Programmation dynamique sur (nombre de positions, budget) : max_profit[k][b] est le meilleur profit
+    avec au plus k actions et un coût d'au plus b.
+    Un seul tableau (max_positions + 1) x (budget + 1) est mis à jour sur place pour chaque action,
+    toutes les couches de positions en une opération vectorisée ; les décisions sont gardées
+    à raison d'un bit par action, par nombre de positions et par niveau de budget.
+    :param costs: coûts entiers
+    :param profits:
+    :param budget:
+    :param max_positions:
+    :return max_profit: tableau (max_positions + 1) x (budget + 1)
+    :return decisions: pour chaque action, bits (max_positions, budget + 1) compactés (1 = action prise)
+    :return total_combinations:
+    """
+    max_profit = np.zeros((max_positions + 1, budget + 1))
+    decisions = np.zeros((len(costs), max_positions, budget // 8 + 1), dtype=np.uint8)
+    total_combinations = 0
+
+    for index, (cost, profit) in enumerate(zip(costs, profits)):
+        if cost > budget:
+            continue
+        total_combinations += max_positions * (budget - cost + 1)
+
+        # Prendre l'action : une position et son coût de moins, calculé sur le tableau avant mise à jour
+        candidate_profit = max_profit[:-1, :budget + 1 - cost] + profit
+        improved = candidate_profit > max_profit[1:, cost:]
+        max_profit[1:, cost:][improved] = candidate_profit[improved]
+
+        taken = np.zeros((max_positions, budget + 1), dtype=bool)
+        taken[:, cost:] = improved
+        decisions[index] = np.packbits(taken, axis=1, bitorder='little')
+
+    return max_profit, decisions, total_combinations
+
+
+def max_affordable_positions(actions, budget=BUDGET):
+    """
+    Nombre maximal d'actions achetables ensemble : les moins chères, tant qu'elles tiennent dans le budget.
+    Aucune limite de positions plus grande ne peut changer le résultat.
+    :param actions:
+    :param budget:
+    :return positions:
+    """
+    costs = np.sort(actions.cost_cents[actions.cost_cents > 0])
+    return int(np.searchsorted(np.cumsum(costs), budget, side='right'))
+
+
+def cardinality_branch_and_bound(actions, budget=BUDGET, max_positions=1):
+    """
+    Séparation et évaluation avec un nombre maximal de positions.
+    Même exploration que branch_and_bound_best_combination ; la borne d'une branche est le minimum
+    de la borne de Dantzig et de la somme des plus grands profits restants, autant que de positions libres.
+    :param actions:
+    :param budget:
+    :param max_positions:
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return best_profit:
+    :return total_combinations: nombre de noeuds explorés
+    """
+    candidates, costs, profits = ratio_candidates(actions, budget)
+    number_of_actions = len(candidates)
+    max_positions = min(max_positions, max_affordable_positions(actions, budget))
+    if max_positions < 1:
+        return [], 0, 0
+
+    # Point de départ : le glouton limité aux max_positions premières actions qui tiennent
+    best_path = []
+    best_profit = 0
+    cost = 0
+    for index in range(number_of_actions):
+        if len(best_path) < max_positions and cost + costs[index] <= budget:
+            best_path.append(index)
+            cost += costs[index]
+            best_profit += profits[index]
+
+    # top_profits[index, m] : somme des m plus grands profits des actions à partir de index
+    # (la somme de toutes s'il y en a moins de m)
+    top_profits = np.zeros((number_of_actions + 1, max_positions + 1))
+    largest = []  # Les max_positions plus grands profits vus, par ordre croissant
+    for index in range(number_of_actions - 1, -1, -1):
+        profit = profits[index]
+        row, next_row = top_profits[index], top_profits[index + 1]
+        # Rang du nouveau profit parmi les plus grands : les sommes suivantes sont décalées d'un rang
+        rank = len(largest) - bisect_right(largest, profit)
+        row[:rank + 1] = next_row[:rank + 1]
+        if rank < max_positions:
+            row[rank + 1:] = next_row[rank:max_positions] + profit
+            insort(largest, profit)
+            if len(largest) > max_positions:
+                del largest[0]
+
+    # Vue mémoire : lecture d'un float Python à chaque nœud, sans scalaire NumPy
+    bound_view = memoryview(top_profits)
+    found_path, best_profit, total_combinations = depth_first_search(
+        costs, profits, budget, best_profit, max_positions,
+        lambda index, free_positions: bound_view[index, free_positions])
+    if found_path is not None:
+        best_path = found_path
+
+    return [candidates[index] for index in best_path], best_profit, total_combinations
+
+
+def cardinality_best_combination(actions, budget=BUDGET, max_positions=1):
+    """
+    Meilleure combinaison exacte avec au plus max_positions actions.
+    Programmation dynamique sur (positions, budget) tant que sa matrice de décisions reste sous
+    CARDINALITY_DP_MAX_CELLS cases, séparation et évaluation sinon.
+    :param actions:
+    :param budget:
+    :param max_positions:
+    :return best_combination: indices des actions de la meilleure combinaison
+    :return best_profit:
+    :return total_combinations:
+    """
+    max_positions = min(max_positions, max_affordable_positions(actions, budget))
+    if max_positions < 1:
+        return [], 0, 0
+    unit = cost_resolution(actions, budget)
+    if len(actions) * max_positions * (budget // unit + 1) > CARDINALITY_DP_MAX_CELLS:
+        return cardinality_branch_and_bound(actions, budget, max_positions)
+
+    costs = scale_costs(actions, unit)
+    budget //= unit
+    max_profit, decisions, total_combinations = cardinality_knapsack_table(
+        costs, actions.profit_amount.tolist(), budget, max_positions)
+
+    # Remonter les décisions : l'action prise libère une position et son coût
+    best_combination = []
+    positions = max_positions
+    budget_level = budget
+    for index in range(len(costs) - 1, -1, -1):
+        if positions and (decisions[index][positions - 1][budget_level >> 3] >> (budget_level & 7)) & 1:
+            best_combination.append(index)
+            positions -= 1
+            budget_level -= costs[index]
+    best_combination.reverse()
+    return best_combination, float(max_profit[max_positions][budget]), total_combinations
+
+
+def add_action_to_top_k_row(row, cost, profit):
+    """
+    Ajouter une action à une ligne « K meilleurs » : row[r, b] est le (r + 1)-ième meilleur profit
+    des combinaisons distinctes de coût au plus b (-inf s'il y a moins de r + 1 combinaisons).
+    La ligne a K + 1 rangs : le dernier, toujours -inf, marque la fin de chaque liste.
+    Pour chaque niveau de budget, les K profits sans l'action et les K profits avec l'action sont deux listes
+    déjà triées : on les fusionne en K étapes (deux curseurs par niveau, à égalité la combinaison sans l'action
+    d'abord, comme trace_top_k_cell). Seuls les niveaux où le meilleur profit avec l'action dépasse strictement
+    le K-ième sans l'action changent ; les autres sont recopiés tels quels. Coût : O(K x niveaux modifiés).
+    :param row: tableau (K + 1) x (budget + 1), non modifié
+    :param cost: coût entier
+    :param profit:
+    :return row: nouvelle ligne
+    """
+    k, levels = row.shape[0] - 1, row.shape[1]
+    new_row = row.copy()
+    if cost >= levels:
+        return new_row
+
+    # Niveaux de budget modifiés par l'action (à égalité, les K combinaisons sans l'action restent devant)
+    changed_levels = np.flatnonzero(row[0, :levels - cost] + profit > row[k - 1, cost:]) + cost
+    if not len(changed_levels):
+        return new_row
+    # Curseurs : positions dans la ligne aplatie de la tête de chaque liste, pour chaque niveau modifié
+    flat_row = row.ravel()
+    without_position = changed_levels.copy()
+    with_position = changed_levels - cost
+    merged_levels = len(changed_levels)
+    skipped = np.empty(merged_levels)
+    taken = np.empty(merged_levels)
+    take_without = np.empty(merged_levels, dtype=bool)
+    step = np.empty(merged_levels, dtype=np.intp)
+    for rank in range(k):
+        np.take(flat_row, without_position, out=skipped)
+        np.take(flat_row, with_position, out=taken)
+        taken += profit
+        np.greater_equal(skipped, taken, out=take_without)
+        new_row[rank, changed_levels] = np.maximum(skipped, taken)
+        # Avancer d'un rang le curseur de la liste choisie
+        np.multiply(take_without, levels, out=step)
+        without_position += step
+        with_position += levels
+        with_position -= step
+    return new_row
+
+
+def trace_top_k_cell(previous_row, cost, profit, budget_level, rank):
+    """
+    Retrouver l'origine d'une entrée de la ligne suivante en fusionnant, pour un seul niveau de budget,
+    les deux listes triées de add_action_to_top_k_row (à égalité, la combinaison sans l'action d'abord) :
+    deux rangs différents mènent toujours à deux combinaisons différentes.
+    :return taken: True si l'entrée contient l'action
+    :return previous_rank: rang de l'entrée d'origine dans previous_row
+    """
+    if cost > budget_level:
+        return False, rank
+    # Le dernier rang (-inf) arrête chaque liste
+    without_action = previous_row[:, budget_level]
+    with_action = previous_row[:, budget_level - cost] + profit
+    without_position = with_position = 0
+    for _ in range(rank + 1):
+        if without_action[without_position] >= with_action[with_position]:
+            without_position += 1
+            source = (False, without_position - 1)
+        else:
+            with_position += 1
+            source = (True, with_position - 1)
+    return source
+
+
+def top_k_best_combinations(actions, budget=BUDGET, k=TOP_K):
+    """
+    Les k meilleurs portefeuilles distincts dans la limite du budget, en une passe de programmation dynamique.
+    Chaque case garde les k meilleurs profits au lieu d'un seul (voir add_action_to_top_k_row).
+    Pour la reconstruction, seules les lignes de points de reprise (toutes les racine(n) actions) sont gardées :
+    les lignes d'un bloc sont recalculées depuis son point de reprise, puis les k portefeuilles sont remontés
+    ensemble à travers ce bloc. Mémoire : environ 2 racine(n) lignes de (k + 1) x (budget + 1) profits,
+    temps : environ deux passes.
+    :param actions:
+    :param budget:
+    :param k:
+    :return portfolios: liste de (indices des actions, profit), du meilleur au moins bon
+    :return total_combinations:
+    """
+    unit = cost_resolution(actions, budget)
+    costs = scale_costs(actions, unit)
+    profits = actions.profit_amount.tolist()
+    budget //= unit
+    count = len(costs)
+    interval = max(1, isqrt(count))
+
+    # Au départ, seule la combinaison vide existe, pour tous les niveaux de budget
+    row = np.full((k + 1, budget + 1), -np.inf)
+    row[0] = 0
+    checkpoints = {}
+    total_combinations = 0
+    for index, (cost, profit) in enumerate(zip(costs, profits)):
+        if index % interval == 0:
+            checkpoints[index] = row
+        if cost <= budget:
+            total_combinations += k * (budget - cost + 1)
+        row = add_action_to_top_k_row(row, cost, profit)
+
+    # États des portefeuilles en cours de reconstruction : [niveau de budget, rang, actions prises]
+    states = [[budget, rank, []] for rank in range(k) if row[rank, budget] > -np.inf]
+    portfolio_profits = [float(row[rank, budget]) for rank in range(len(states))]
+    for start in sorted(checkpoints, reverse=True):
+        stop = min(start + interval, count)
+        rows = [checkpoints[start]]
+        for index in range(start, stop - 1):
+            rows.append(add_action_to_top_k_row(rows[-1], costs[index], profits[index]))
+        for index in range(stop - 1, start - 1, -1):
+            for state in states:
+                taken, state[1] = trace_top_k_cell(rows[index - start], costs[index], profits[index],
+                                                   state[0], state[1])
+                if taken:
+                    state[0] -= costs[index]
+                    state[2].append(index)
+        del checkpoints[start]
+
+    portfolios = [(sorted(state[2]), profit) for state, profit in zip(states, portfolio_profits)]
+    return portfolios, total_combinations
+
+
+def display_results(algorithm_name, execution_time, best_combination, best_profit, best_combination_cost, total_combinations,
+                    guaranteed_bound=None):
     """
     Affiche les résultats sous forme de deux tableaux.
     :param algorithm_name:
@@ -131,6 +1503,7 @@ def display_results(algorithm_name, execution_time, best_combination, best_profi
     :param best_profit:
     :param best_combination_cost:
     :param total_combinations:
+    :param guaranteed_bound: pour un algorithme approché, profit qu'aucune combinaison ne peut dépasser
     """
 
     # Premier tableau : Résumé des résultats
@@ -141,6 +1514,15 @@ def display_results(algorithm_name, execution_time, best_combination, best_profi
         "Coût total de la meilleur combinaison d'actions (€)": [best_combination_cost / 100],
         "Profit de la meilleure combinaison (€)": [round(best_profit / 100, 2)]
     })
+    if guaranteed_bound is not None:
+        summary_dataframe["Borne garantie (€)"] = round(guaranteed_bound / 100, 2)
+
+    print("Résumé des résultats :")
+    print(summary_dataframe.to_string())
+    print("Meilleure combinaison d'actions :")
+    if not best_combination:
+        print("Aucune action sélectionnée")
+        return
 
     # Second tableau : détails des actions sélectionnées
     best_combination_dataframe = pd.DataFrame(best_combination)
@@ -153,31 +1535,322 @@ def display_results(algorithm_name, execution_time, best_combination, best_profi
     best_combination_dataframe['profit'] = best_combination_dataframe['profit'] * 100
     best_combination_dataframe['profit'] = best_combination_dataframe['profit'].astype(str) + '%'
 
-    print("Résumé des résultats :")
-    print(summary_dataframe.to_string())
-    print("Meilleure combinaison d'actions :")
     print(best_combination_dataframe)
 
 
-def main(csv_files):
+def display_frontier(actions, frontier, step):
+    """
+    Afficher la frontière efficiente par paliers de budget.
+    :param actions:
+    :param frontier: BudgetFrontier
+    :param step: écart entre deux paliers, en centimes
+    """
+    frontier_dataframe = pd.DataFrame([
+        {
+            "Budget (€)": budget / 100,
+            "Profit (€)": round(frontier.profit(budget) / 100, 2),
+            "Coût total (€)": actions.selection_cost(frontier.combination(budget)) / 100,
+            "Nombre d'actions": len(frontier.combination(budget)),
+        }
+        for budget in range(step, frontier.max_budget + 1, step)
+    ])
+    print("Frontière efficiente :")
+    print(frontier_dataframe.to_string())
+
+
+def plot_frontier(frontier, title="Frontière efficiente"):
+    """
+    Générer le graphique du meilleur profit en fonction du budget.
+    :param frontier: BudgetFrontier
+    :param title:
+    """
+    import matplotlib.pyplot as plt
+
+    plt.plot(frontier.budgets() / 100, frontier.max_profit_for_budget / 100)
+    plt.xlabel("Budget (€)")
+    plt.ylabel("Profit maximal (€)")
+    plt.title(title)
+    plt.grid(True)
+    plt.show()
+
+
+def solver_settings(algorithm_name, epsilon=None):
+    """
+    Réglages qui changent le résultat d'un algorithme (combinaison ou nombre de combinaisons),
+    ajoutés à la clé du cache : modifier l'un d'eux rend les anciens résultats invalides.
+    :param algorithm_name: nom affiché de l'algorithme
+    :param epsilon: précision de l'approximation FPTAS
+    :return settings: dictionnaire sérialisable en JSON
+    """
+    knapsack = {"backend": KNAPSACK_BACKEND, "hirschberg_base_cells": HIRSCHBERG_BASE_CELLS,
+                "pareto": [PARETO_MIN_CELLS, PARETO_PROBE_ACTIONS, PARETO_STATE_COST,
+                           PARETO_ABORT_FACTOR]}
+    if algorithm_name.startswith(CARDINALITY_NAME):
+        return {"dp_max_cells": CARDINALITY_DP_MAX_CELLS}
+    return {
+        "Glouton amélioré": {"local_search": [LOCAL_SEARCH_SELECTED, LOCAL_SEARCH_CANDIDATES,
+                                              LOCAL_SEARCH_ITERATIONS]},
+        "Programmation dynamique": knapsack,
+        CORE_NAME: dict(knapsack, tolerance=CORE_TOLERANCE),
+        FPTAS_NAME: {"epsilon": epsilon},
+    }.get(algorithm_name, {})
+
+
+def solve_file(file, budget=BUDGET, cache_directory=None, epsilon=None, max_positions=None):
+    """
+    Charger un fichier et lancer les algorithmes glouton, sac à dos et séparation et évaluation.
+    Fonction autonome pour pouvoir être exécutée dans un processus du mode lot.
+    Avec un cache, chaque résultat déjà calculé pour les mêmes actions, le même budget,
+    le même algorithme, la même résolution et les mêmes réglages (voir solver_settings)
+    est relu au lieu d'être recalculé.
+    :param file:
+    :param budget:
+    :param cache_directory: dossier du cache des résultats (None pour ne pas l'utiliser)
+    :param epsilon: lancer aussi l'approximation FPTAS avec cette précision (None pour ne pas la lancer)
+    :param max_positions: lancer aussi la recherche limitée à ce nombre d'actions (None pour ne pas la lancer)
+    :return file_result: dictionnaire avec les actions, le temps de chargement, la résolution des coûts
+                         et un résultat par algorithme (combinaison sous forme d'indices)
+    """
+    start_time = perf_counter()
+    actions = load_actions(file, budget)
+    load_time = perf_counter() - start_time
+
+    resolution = cost_resolution(actions, budget)
+    cache = ResultCache(cache_directory) if cache_directory else None
+    actions_digest = action_set_digest(actions) if cache else None
+
+    algorithms = list(ALGORITHMS)
+    if epsilon:
+        algorithms.append((FPTAS_NAME, partial(fptas_best_combination, epsilon=epsilon)))
+    if max_positions:
+        algorithms.append((f"{CARDINALITY_NAME} ({max_positions})",
+                           partial(cardinality_best_combination, max_positions=max_positions)))
+
+    results = []
+    for algorithm_name, algorithm in algorithms:
+        key = (cache_key(actions_digest, budget, algorithm_name, resolution, solver_settings(algorithm_name, epsilon))
+               if cache else None)
+        entry = cache.get(key) if cache else None
+        if entry is not None:
+            results.append(dict(entry, cached=True))
+            continue
+
+        with instrumentation.phase("solve", file=file, algorithm=algorithm_name) as phase:
+            start_time = perf_counter()
+            solution = algorithm(actions, budget=budget)
+            end_time = perf_counter()
+            phase.count(solution[-1])
+        best_combination, best_profit, total_combinations = solution[0], solution[1], solution[-1]
+        result = {
+            "algorithm_name": algorithm_name,
+            "execution_time": end_time - start_time,
+            "load_time": load_time,
+            "best_combination": [int(index) for index in best_combination],
+            "best_profit": float(best_profit),
+            "best_combination_cost": actions.selection_cost(best_combination),
+            "total_combinations": int(total_combinations),
+        }
+        # Information propre à l'algorithme, renvoyée en troisième position (voir SOLUTION_DETAILS)
+        if algorithm_name in SOLUTION_DETAILS:
+            result[SOLUTION_DETAILS[algorithm_name]] = float(solution[2])
+        if cache:
+            cache.put(key, result)
+        results.append(dict(result, cached=False))
+
+    return {
+        "file": file,
+        "actions": actions,
+        "load_time": load_time,
+        "resolution": resolution,
+        "results": results,
+        "cache_hits": cache.hits if cache else 0,
+        "cache_misses": cache.misses if cache else 0,
+    }
+
+
+def display_report(file_results):
+    """
+    Afficher le rapport consolidé : une ligne par fichier et par algorithme, avec les durées.
+    :param file_results:
+    """
+    report_dataframe = pd.DataFrame([
+        {
+            "Fichier": file_result["file"],
+            "Chargement (s)": file_result["load_time"],
+            "Algorithme": result["algorithm_name"],
+            "Durée d'exécution (s)": result["execution_time"],
+            "Nombre de combinaisons": result["total_combinations"],
+            "Coût total (€)": result["best_combination_cost"] / 100,
+            "Profit (€)": round(result["best_profit"] / 100, 2),
+            "Cache": "oui" if result["cached"] else "non",
+        }
+        for file_result in file_results
+        for result in file_result["results"]
+    ])
+    print("Rapport consolidé :")
+    print(report_dataframe.to_string())
+    cache_hits = sum(file_result["cache_hits"] for file_result in file_results)
+    cache_misses = sum(file_result["cache_misses"] for file_result in file_results)
+    if cache_hits or cache_misses:
+        print(f"Cache : {cache_hits} résultat(s) relu(s), {cache_misses} calculé(s)")
+
+
+ALGORITHMS = [
+    ("Algorithme glouton", greedy_best_combination),
+    ("Glouton amélioré", improved_greedy_best_combination),
+    ("Programmation dynamique", knapsack_best_combination),
+    ("Séparation et évaluation", branch_and_bound_best_combination),
+    (CORE_NAME, core_best_combination),
+]
+
+# Algorithmes dont le troisième résultat est affiché : nom -> clé dans le résultat
+SOLUTION_DETAILS = {
+    FPTAS_NAME: "guaranteed_bound",
+    CORE_NAME: "eliminated_actions",
+}
+
+
+def frontier_main(csv_files, step, plot=False):
+    """
+    Afficher, pour chaque fichier, la frontière efficiente calculée en une seule passe.
+    :param csv_files:
+    :param step: écart entre deux paliers, en centimes
+    :param plot: afficher aussi le graphique
+    """
     for file in csv_files:
         print(f"Traitement du fichier : {file}")
-        df = upload_data(file)
-        actions = df.to_dict('records')
+        actions = load_actions(file)
+        frontier = knapsack_frontier(actions, BUDGET)
+        display_frontier(actions, frontier, step)
+        if plot:
+            plot_frontier(frontier, title=f"Frontière efficiente : {file}")
+
 
-        # Algorithme glouton
+def lots_main(csv_files, max_lots):
+    """
+    Afficher, pour chaque fichier, la meilleure combinaison quand chaque action peut être achetée en plusieurs lots.
+    :param csv_files:
+    :param max_lots: nombre maximal de lots des actions pour lesquelles le fichier n'en donne pas
+    """
+    for file in csv_files:
+        print(f"Traitement du fichier : {file}")
+        actions = load_actions(file)
         start_time = perf_counter()
-        best_combination, best_profit, best_combination_cost, total_combinations = greedy_best_combination(actions, budget=BUDGET)
-        end_time = perf_counter()
-        display_results("Algorithme glouton", end_time - start_time, best_combination, best_profit, best_combination_cost, total_combinations)
+        best_quantities, best_profit, total_combinations = bounded_knapsack_best_combination(actions, BUDGET, max_lots)
+        execution_time = perf_counter() - start_time
 
-        # Algorithme sac à dos
+        indices = [index for index, _ in best_quantities]
+        best_combination = actions.records(indices)
+        for record, (_, quantity) in zip(best_combination, best_quantities):
+            record['lots'] = quantity
+        best_combination_cost = sum(int(actions.cost_cents[index]) * quantity for index, quantity in best_quantities)
+        display_results(f"Sac à dos borné ({max_lots} lot(s) par défaut)", execution_time, best_combination,
+                        best_profit, best_combination_cost, total_combinations)
+
+
+def top_k_main(csv_files, k=TOP_K):
+    """
+    Afficher, pour chaque fichier, les k meilleurs portefeuilles distincts.
+    :param csv_files:
+    :param k:
+    """
+    for file in csv_files:
+        print(f"Traitement du fichier : {file}")
+        actions = load_actions(file)
         start_time = perf_counter()
-        best_combination, best_profit, total_combinations = knapsack_best_combination(actions, budget=BUDGET)
-        end_time = perf_counter()
-        best_combination_cost = sum(action['cost'] for action in best_combination)
-        display_results("Programmation dynamique", end_time - start_time, best_combination, best_profit, best_combination_cost, total_combinations)
+        portfolios, total_combinations = top_k_best_combinations(actions, BUDGET, k)
+        execution_time = perf_counter() - start_time
+
+        portfolios_dataframe = pd.DataFrame([
+            {
+                "Rang": rank,
+                "Profit (€)": round(profit / 100, 2),
+                "Coût total (€)": actions.selection_cost(combination) / 100,
+                "Nombre d'actions": len(combination),
+                "Actions": ", ".join(str(actions.names[index]) for index in combination),
+            }
+            for rank, (combination, profit) in enumerate(portfolios, start=1)
+        ])
+        print(f"{len(portfolios)} meilleurs portefeuilles ({execution_time:.4f} s, "
+              f"{total_combinations} combinaisons) :")
+        print(portfolios_dataframe.to_string(index=False, max_colwidth=80))
+
+
+def main(csv_files, max_workers=None, cache_directory=CACHE_DIRECTORY, epsilon=None, max_positions=None):
+    """
+    Traiter les fichiers et afficher les résultats.
+    Avec max_workers, les fichiers sont répartis entre plusieurs processus : le chargement d'un fichier
+    se fait pendant la résolution des autres. Les résultats sont affichés dans l'ordre des fichiers,
+    quel que soit le nombre de processus.
+    :param csv_files:
+    :param max_workers: nombre de processus du mode lot (None pour un traitement séquentiel)
+    :param cache_directory: dossier du cache des résultats (None pour tout recalculer)
+    :param epsilon: précision de l'approximation FPTAS (None pour ne pas la lancer)
+    :param max_positions: nombre maximal d'actions de la recherche limitée (None pour ne pas la lancer)
+    """
+    solve = partial(solve_file, budget=BUDGET, cache_directory=cache_directory, epsilon=epsilon,
+                    max_positions=max_positions)
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers else None
+    try:
+        file_results = executor.map(solve, csv_files) if executor else map(solve, csv_files)
+        report = []
+        for file_result in file_results:
+            print(f"Traitement du fichier : {file_result['file']}")
+            print(f"Résolution des coûts : {file_result['resolution']} centime(s)")
+            for result in file_result["results"]:
+                with instrumentation.phase("display", file=file_result["file"],
+                                           algorithm=result["algorithm_name"]) as phase:
+                    best_combination = file_result["actions"].records(result["best_combination"])
+                    phase.count(len(best_combination))
+                    display_results(result["algorithm_name"], result["execution_time"], best_combination,
+                                    result["best_profit"], result["best_combination_cost"],
+                                    result["total_combinations"], result.get("guaranteed_bound"))
+                if result.get("eliminated_actions") is not None:
+                    print(f"Réduction au noyau : {int(result['eliminated_actions'])} action(s) éliminée(s) "
+                          f"sur {len(file_result['actions'])}")
+            report.append(file_result)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    display_report(report)
 
 
 if __name__ == "__main__":
-    main(CSV_FILES)
+    parser = argparse.ArgumentParser(description="Sélection des actions les plus rentables dans la limite du budget.")
+    parser.add_argument("files", nargs="*", default=CSV_FILES, help="fichiers CSV à traiter")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="traiter les fichiers en lot avec ce nombre de processus")
+    parser.add_argument("--frontier", type=int, default=None, metavar="PALIER",
+                        help="afficher la frontière efficiente par paliers de PALIER euros")
+    parser.add_argument("--plot", action="store_true", help="avec --frontier, afficher aussi le graphique")
+    parser.add_argument("--top", type=int, default=None, metavar="K",
+                        help="afficher les K meilleurs portefeuilles distincts")
+    parser.add_argument("--lots", type=int, default=None, metavar="K",
+                        help="autoriser plusieurs lots par action : colonne max_lots du fichier, sinon K lots")
+    parser.add_argument("--max-positions", type=int, default=None, metavar="K",
+                        help="lancer aussi la recherche exacte limitée à K actions")
+    parser.add_argument("--epsilon", type=float, default=None, metavar="ε",
+                        help="lancer aussi l'approximation FPTAS, à (1 - ε) près du profit optimal")
+    parser.add_argument("--no-cache", action="store_true", help="ignorer le cache et tout recalculer")
+    parser.add_argument("--instrument", metavar="FICHIER",
+                        help="écrire les mesures de chaque phase en JSON Lines dans FICHIER (\"-\" pour l'écran)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="avec --instrument, mesurer aussi le pic de mémoire (tracemalloc)")
+    arguments = parser.parse_args()
+    if arguments.lots is not None and arguments.lots < 0:
+        parser.error("--lots doit être positif ou nul")
+    if arguments.instrument:
+        # Les variables d'environnement activent aussi l'instrumentation dans les processus du mode lot
+        os.environ[OUTPUT_VARIABLE] = arguments.instrument
+        os.environ[MEMORY_VARIABLE] = "1" if arguments.trace_memory else "0"
+        instrumentation.configure(True, arguments.trace_memory, arguments.instrument)
+    if arguments.frontier:
+        frontier_main(arguments.files, arguments.frontier * 100, arguments.plot)
+    elif arguments.top:
+        top_k_main(arguments.files, arguments.top)
+    elif arguments.lots is not None:
+        lots_main(arguments.files, arguments.lots)
+    else:
+        main(arguments.files, arguments.workers, None if arguments.no_cache else CACHE_DIRECTORY, arguments.epsilon,
+             arguments.max_positions)
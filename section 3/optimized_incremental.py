@@ -0,0 +1,256 @@
+import random
+from math import isqrt
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from optimized import ActionSet, BUDGET, add_action_to_row, knapsack_best_combination, knapsack_row, load_actions
+
+
+CSV_FILE = "../datasets/dataset1_Python+P7.csv"
+TICKS = 200  # Nombre de variations de prix simulées
+HOT_SHARES = 20  # Les variations portent sur ce nombre d'actions, tirées au hasard
+
+
+class IncrementalKnapsack:
+    """
+    Solveur sac à dos incrémental pour les variations de prix en cours de journée.
+    Les actions stables sont rangées dans un ordre fixe et découpées en blocs. Aux frontières des blocs,
+    on garde la ligne de programmation dynamique des actions précédentes (préfixe) et celle des actions
+    suivantes (suffixe). Les actions modifiées depuis la dernière réorganisation forment la queue :
+    elles sont ajoutées à chaque requête, puis combinées au suffixe en O(budget)
+    (le meilleur profit est le maximum de préfixe[b] + suffixe[budget - b]).
+    Coût d'une requête :
+    - action déjà dans la queue : O(|queue| x budget), aucune ligne mémorisée n'est invalidée ;
+    - première modification d'une action stable : elle passe dans la queue et les lignes entre sa position
+      et celle de la première modification précédente sont reconstruites, soit O(|i - j| x budget) une seule fois ;
+    - quand la queue dépasse max_tail actions, elle est rangée en fin d'ordre stable et toutes les lignes
+      sont recalculées à la demande (une passe complète, amortie sur max_tail premières modifications).
+    """
+
+    def __init__(self, actions, budget=BUDGET, block_size=None, max_tail=None):
+        """
+        :param actions: ActionSet
+        :param budget:
+        :param block_size: nombre d'actions par bloc (par défaut, la racine carrée du nombre d'actions)
+        :param max_tail: taille de la queue au-delà de laquelle elle est rangée (par défaut, block_size)
+        """
+        self.budget = budget
+        self.names = list(actions.names)
+        self.costs = actions.cost_cents.tolist()
+        self.rates = actions.profit.tolist()
+        self.active = [True] * len(self.costs)
+        self.block_size = block_size or max(1, isqrt(len(self.costs)))
+        self.max_tail = max_tail or self.block_size
+        # Ordre des actions stables (None à la place des actions passées dans la queue) et position de chaque action
+        self._order = list(range(len(self.costs)))
+        self._positions = list(range(len(self.costs)))
+        self._tail = []
+        # Lignes mémorisées aux frontières des blocs, indexées par position dans l'ordre stable
+        self._prefix_rows = {}
+        self._suffix_rows = {}
+        # Position de la dernière action stable passée dans la queue : son bloc est recalculé à chaque requête
+        self._last_changed = 0
+
+    def __len__(self):
+        return len(self.costs)
+
+    def _add_action(self, row, index):
+        """
+        Ajouter une action à une ligne si elle est active et de coût positif.
+        """
+        if self.active[index] and self.costs[index] > 0:
+            add_action_to_row(row, self.costs[index], self.costs[index] * self.rates[index])
+
+    def _add_actions(self, row, start, stop):
+        """
+        Ajouter à une ligne les actions stables des positions start à stop - 1.
+        """
+        for index in self._order[start:stop]:
+            if index is not None:
+                self._add_action(row, index)
+
+    def _prefix_row(self, position):
+        """
+        Ligne des actions stables [0, position), reconstruite depuis la frontière valide la plus proche.
+        """
+        if position == 0:
+            return np.zeros(self.budget + 1)
+        if position not in self._prefix_rows:
+            start = max((known for known in self._prefix_rows if known < position), default=0)
+            row = self._prefix_rows[start].copy() if start in self._prefix_rows else np.zeros(self.budget + 1)
+            for boundary in range(start, position, self.block_size):
+                self._add_actions(row, boundary, min(boundary + self.block_size, position))
+                self._prefix_rows[min(boundary + self.block_size, position)] = row.copy()
+        return self._prefix_rows[position]
+
+    def _suffix_row(self, position):
+        """
+        Ligne des actions stables [position, fin), reconstruite depuis la frontière valide la plus proche.
+        """
+        count = len(self._order)
+        if position >= count:
+            return np.zeros(self.budget + 1)
+        if position not in self._suffix_rows:
+            stop = min((known for known in self._suffix_rows if known > position), default=count)
+            row = self._suffix_rows[stop].copy() if stop in self._suffix_rows else np.zeros(self.budget + 1)
+            # Les frontières sont des multiples de block_size (et la fin de l'ordre)
+            boundary = stop
+            while boundary > position:
+                start = max(position, (boundary - 1) // self.block_size * self.block_size)
+                self._add_actions(row, start, boundary)
+                self._suffix_rows[start] = row.copy()
+                boundary = start
+        return self._suffix_rows[position]
+
+    def _make_volatile(self, index):
+        """
+        Passer une action dans la queue, à sa première modification, et oublier les lignes qui la contenaient.
+        """
+        position = self._positions[index]
+        if position is None:
+            return
+        self._order[position] = None
+        self._positions[index] = None
+        self._tail.append(index)
+        self._prefix_rows = {known: row for known, row in self._prefix_rows.items() if known <= position}
+        self._suffix_rows = {known: row for known, row in self._suffix_rows.items() if known > position}
+        self._last_changed = position
+        if len(self._tail) > self.max_tail:
+            self._rebase()
+
+    def _rebase(self):
+        """
+        Ranger la queue à la fin de l'ordre stable (en retirant les places vides) et oublier toutes les lignes.
+        """
+        stable = [index for index in self._order if index is not None]
+        self._last_changed = len(stable)
+        self._order = stable + self._tail
+        self._tail = []
+        for position, index in enumerate(self._order):
+            self._positions[index] = position
+        self._prefix_rows = {}
+        self._suffix_rows = {}
+
+    def update(self, index, cost_cents=None, profit=None):
+        """
+        Modifier le coût (en centimes) et/ou le bénéfice (en décimale) d'une action.
+        :param index:
+        :param cost_cents:
+        :param profit:
+        """
+        if cost_cents is not None:
+            self.costs[index] = int(cost_cents)
+        if profit is not None:
+            self.rates[index] = float(profit)
+        self._make_volatile(index)
+
+    def add(self, name, cost_cents, profit):
+        """
+        Ajouter une action, directement dans la queue.
+        :return index:
+        """
+        self.names.append(name)
+        self.costs.append(int(cost_cents))
+        self.rates.append(float(profit))
+        self.active.append(True)
+        self._positions.append(None)
+        self._tail.append(len(self.costs) - 1)
+        if len(self._tail) > self.max_tail:
+            self._rebase()
+        return len(self.costs) - 1
+
+    def remove(self, index):
+        """
+        Retirer une action (son indice reste réservé).
+        :param index:
+        """
+        self.active[index] = False
+        self._make_volatile(index)
+
+    def best_profit(self):
+        """
+        Meilleur profit possible dans le budget avec les données actuelles.
+        Coût : bloc de la dernière action passée dans la queue, actions de la queue et combinaison
+        préfixe/suffixe en O(budget), plus les lignes invalidées depuis la requête précédente
+        (voir la description de la classe).
+        :return best_profit:
+        """
+        count = len(self._order)
+        start = min(self._last_changed, count) // self.block_size * self.block_size
+        stop = min(start + self.block_size, count)
+
+        row = self._prefix_row(start).copy()
+        self._add_actions(row, start, stop)
+        for index in self._tail:
+            self._add_action(row, index)
+        suffix_row = self._suffix_row(stop)
+        return float(np.max(row + suffix_row[::-1]))
+
+    def action_set(self):
+        """
+        Instantané des actions actives.
+        :return actions: ActionSet
+        :return indices: indice de chaque action de l'instantané dans le solveur
+        """
+        indices = [index for index, active in enumerate(self.active) if active]
+        actions = ActionSet([self.names[index] for index in indices],
+                            [self.costs[index] for index in indices],
+                            [self.rates[index] for index in indices])
+        return actions, indices
+
+    def best_combination(self):
+        """
+        Meilleure combinaison complète (indices du solveur), par une passe complète du sac à dos.
+        À n'appeler que lorsque le détail du portefeuille est nécessaire.
+        :return best_combination:
+        :return best_profit:
+        """
+        actions, indices = self.action_set()
+        best_combination, best_profit, _ = knapsack_best_combination(actions, self.budget)
+        return [indices[index] for index in best_combination], best_profit
+
+
+def main(csv_file):
+    actions = load_actions(csv_file)
+
+    # Référence : une passe complète sur une seule ligne, sans matrice de décisions
+    start_time = perf_counter()
+    full_profit = float(knapsack_row(actions.cost_cents.tolist(), actions.profit_amount.tolist(), BUDGET)[BUDGET])
+    full_time = perf_counter() - start_time
+
+    solver = IncrementalKnapsack(actions)
+    solver.best_profit()
+
+    # Simuler des variations de prix sur quelques actions, comme en cours de séance
+    generator = random.Random(0)
+    hot_shares = generator.sample(range(len(solver)), min(HOT_SHARES, len(solver)))
+    touched = set()
+    ticks = []
+    for _ in range(TICKS):
+        index = generator.choice(hot_shares)
+        new_cost = max(1, round(solver.costs[index] * generator.uniform(0.95, 1.05)))
+        start_time = perf_counter()
+        solver.update(index, cost_cents=new_cost)
+        profit = solver.best_profit()
+        ticks.append({
+            "Première modification": index not in touched,
+            "Durée de mise à jour (s)": perf_counter() - start_time,
+            "Profit (€)": round(profit / 100, 2),
+        })
+        touched.add(index)
+
+    # Vérification : une passe complète sur les données finales
+    actions, _ = solver.action_set()
+    final_profit = float(knapsack_row(actions.cost_cents.tolist(), actions.profit_amount.tolist(), BUDGET)[BUDGET])
+
+    ticks = pd.DataFrame(ticks)
+    print(f"Passe complète (une ligne) : {full_time:.4f} s, profit {full_profit / 100:.2f} €")
+    print(f"{TICKS} variations sur {len(hot_shares)} actions :")
+    print(ticks.groupby("Première modification")["Durée de mise à jour (s)"].agg(["count", "mean", "max"]).to_string())
+    print(f"Profit final : {ticks['Profit (€)'].iloc[-1]:.2f} € (passe complète : {final_profit / 100:.2f} €)")
+
+
+if __name__ == "__main__":
+    main(CSV_FILE)
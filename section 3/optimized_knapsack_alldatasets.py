@@ -1,8 +1,10 @@
+import numpy as np
 import pandas as pd
-import time
+from time import perf_counter
 
 CSV_FILES = ["../datasets/actions_list.csv", "../datasets/dataset1_Python+P7.csv", "../datasets/dataset2_Python+P7.csv"]
 BUDGET = 500*100
+KNAPSACK_BACKEND = "numpy"  # "python" ou "numpy"
 
 # Charger et nettoyer les données
 def upload_data(CSV_FILE):
@@ -50,22 +52,25 @@ def upload_data(CSV_FILE):
     return dataframe
 
 
-def find_best_combination(actions, budget=BUDGET):
+def find_best_combination(actions, budget=BUDGET, backend=KNAPSACK_BACKEND):
     """
     :param actions:
     :param budget:
-    :return selected_actions[budget]:
+    :param backend: "python" pour la boucle de référence, "numpy" pour le calcul vectorisé
+    :return best_combination:
     :return max_profit_for_budget[budget]:
     :return total_combinations:
     """
+    if backend == "numpy":
+        return find_best_combination_numpy(actions, budget)
 
     # Créer un tableau pour stocker le meilleur profit pour chaque budget (de 0 à 50000). Commence à 0 d'où le + 1
     max_profit_for_budget = [0] * (budget + 1)
 
-    # Créer un tableau pour stocker les actions sélectionnées pour chaque budget (Ex : selected_actions = [
-    #     #[],  # Indice 0 : budget de 0 centime
-    #     #[],  # Indice 1 : budget de 1 centime...
-    selected_actions = [[] for _ in range(budget + 1)]
+    # Créer une matrice de décisions : pour chaque action, un bit par niveau de budget
+    # indique si l'action a été prise à ce niveau
+    decisions = []
+    costs = []
 
     # Compter le nombre total de combinaisons évaluées
     total_combinations = 0
@@ -74,6 +79,7 @@ def find_best_combination(actions, budget=BUDGET):
     for action in actions:
         cost = int(action['cost'])  # On récupère le coût de l'action
         profit = action['profit_amount']
+        taken = bytearray(budget // 8 + 1)
 
         # Mettre à jour le tableau dp de manière descendante pour éviter d'écraser les données
         for budget_level in range(budget, cost - 1, -1): # Start = budget, stop = cost-1 (sinon coût exclus), step = -1
@@ -82,11 +88,72 @@ def find_best_combination(actions, budget=BUDGET):
             if max_profit_for_budget[budget_level - cost] + profit > max_profit_for_budget[budget_level]:
                 # Mettre à jour le profit maximal pour ce niveau de budget en incluant cette action
                 max_profit_for_budget[budget_level] = max_profit_for_budget[budget_level - cost] + profit
-                # Mettre à jour la liste d'actions sélectionnées pour atteindre ce profit maximal à ce niveau de budget
-                selected_actions[budget_level] = selected_actions[budget_level - cost] + [action]
+                # Mémoriser que l'action est prise à ce niveau de budget
+                taken[budget_level >> 3] |= 1 << (budget_level & 7)
 
-    # Le meilleur profit sera à dp[budget], avec les actions correspondantes
-    return selected_actions[budget], max_profit_for_budget[budget], total_combinations
+        decisions.append(taken)
+        costs.append(cost)
+
+    # Le meilleur profit sera à dp[budget], les actions sont retrouvées en remontant les décisions
+    best_combination = reconstruct_combination(actions, costs, decisions, budget)
+    return best_combination, max_profit_for_budget[budget], total_combinations
+
+
+def find_best_combination_numpy(actions, budget=BUDGET):
+    """
+    Version vectorisée : chaque action est traitée en une seule opération sur toute la ligne
+    max_profit_for_budget. Retourne la même sélection et le même profit que la boucle de référence.
+    :param actions:
+    :param budget:
+    :return best_combination:
+    :return max_profit_for_budget[budget]:
+    :return total_combinations:
+    """
+    max_profit_for_budget = np.zeros(budget + 1)
+    # Matrice de décisions compactée : un bit par action et par niveau de budget
+    decisions = np.zeros((len(actions), budget // 8 + 1), dtype=np.uint8)
+    costs = []
+    total_combinations = 0
+
+    for index, action in enumerate(actions):
+        cost = int(action['cost'])
+        profit = action['profit_amount']
+        costs.append(cost)
+        if cost > budget:
+            continue
+        total_combinations += budget - cost + 1
+
+        # Profit obtenu en ajoutant l'action à chaque niveau de budget (calculé sur la ligne avant mise à jour)
+        candidate_profit = max_profit_for_budget[:budget + 1 - cost] + profit
+        improved = candidate_profit > max_profit_for_budget[cost:]
+        max_profit_for_budget[cost:][improved] = candidate_profit[improved]
+
+        # Mémoriser les niveaux de budget où l'action est prise
+        taken = np.zeros(budget + 1, dtype=bool)
+        taken[cost:] = improved
+        decisions[index] = np.packbits(taken, bitorder='little')
+
+    best_combination = reconstruct_combination(actions, costs, decisions, budget)
+    return best_combination, float(max_profit_for_budget[budget]), total_combinations
+
+
+def reconstruct_combination(actions, costs, decisions, budget=BUDGET):
+    """
+    Reconstruire la meilleure combinaison en remontant la matrice de décisions.
+    :param actions:
+    :param costs:
+    :param decisions: un bit par action et par niveau de budget (1 = action prise)
+    :param budget:
+    :return best_combination:
+    """
+    best_combination = []
+    budget_level = budget
+    for index in range(len(actions) - 1, -1, -1):
+        if (decisions[index][budget_level >> 3] >> (budget_level & 7)) & 1:
+            best_combination.append(actions[index])
+            budget_level -= costs[index]
+    best_combination.reverse()
+    return best_combination
 
 def display_results(execution_time, best_combination, best_profit, best_combination_cost, total_combinations):
 
@@ -123,11 +190,11 @@ def main(csv_files):
         actions = df.to_dict('records')
 
         # Démarrer le chronomètre uniquement pour l'algorithme
-        start_time = time.time()
+        start_time = perf_counter()
         # Trouver la meilleure combinaison d'actions dans le budget avec programmation dynamique
         best_combination, best_profit, total_combinations = find_best_combination(actions)
         # Arrêter le chronomètre
-        end_time = time.time()
+        end_time = perf_counter()
         # Calculer la durée d'exécution
         execution_time = end_time - start_time
 
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+CACHE_DIRECTORY = ".cache"
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # Taille maximale du cache sur disque (64 Mo)
+CACHE_FORMAT = 2  # Version des clés et des résultats : l'augmenter rend invalides tous les anciens résultats
+
+
+def action_set_digest(actions):
+    """
+    Empreinte SHA-256 d'un ensemble d'actions nettoyé (noms, coûts en centimes et bénéfices, dans l'ordre).
+    Deux fichiers différents qui donnent les mêmes actions ont la même empreinte.
+    :param actions: ActionSet
+    :return digest:
+    """
+    digest = hashlib.sha256()
+    digest.update(len(actions).to_bytes(8, 'little'))
+    digest.update(actions.cost_cents.astype('<i8').tobytes())
+    digest.update(actions.profit.astype('<f8').tobytes())
+    for name in actions.names:
+        digest.update(str(name).encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+
+def cache_key(actions_digest, budget, algorithm_name, resolution, settings=None):
+    """
+    Clé d'un résultat : version du format, empreinte des actions, budget, algorithme, résolution des coûts
+    et réglages de l'algorithme (moteur, constantes, précision...).
+    :param actions_digest: voir action_set_digest
+    :param budget:
+    :param algorithm_name:
+    :param resolution: unité de coût en centimes
+    :param settings: dictionnaire sérialisable en JSON des réglages qui changent le résultat
+    :return key:
+    """
+    description = json.dumps([CACHE_FORMAT, actions_digest, budget, algorithm_name, resolution, settings or {}],
+                             sort_keys=True)
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache persistant des résultats, un fichier JSON par résultat.
+    Chaque lecture rafraîchit la date du fichier ; quand la taille totale dépasse max_bytes,
+    les résultats utilisés le moins récemment sont supprimés (LRU).
+    Le cache peut être partagé entre plusieurs processus.
+    """
+
+    def __init__(self, directory=CACHE_DIRECTORY, max_bytes=CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        """
+        :param key:
+        :return entry: dictionnaire enregistré, ou None si absent
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as cache_file:
+                entry = json.load(cache_file)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """
+        Enregistrer un résultat, puis libérer de la place si nécessaire.
+        :param key:
+        :param entry: dictionnaire sérialisable en JSON
+        """
+        path = self._path(key)
+        temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(entry, cache_file)
+        # Remplacement atomique : un autre processus ne lit jamais un fichier à moitié écrit
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Supprimer les résultats les moins récemment utilisés jusqu'à repasser sous max_bytes.
+        """
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total_size -= size
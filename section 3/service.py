@@ -0,0 +1,332 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from optimized import (CSV_FILES, cost_resolution, knapsack_best_combination, knapsack_frontier, load_actions,
+                       parse_cents)
+
+
+HOST = "127.0.0.1"
+PORT = 8000
+MAX_BUDGET = 100000 * 100  # Budget maximal accepté par le service, en centimes
+# Taille maximale d'un calcul (actions x niveaux de budget) : au-delà, la réponse prendrait plus d'une seconde
+MAX_SOLVE_CELLS = 2 ** 29
+# Au-delà de ce nombre de cases, chaque budget est résolu en mémoire linéaire au lieu de passer par
+# la matrice de décisions de la frontière (un bit par case, soit 8 Mo)
+MAX_FRONTIER_CELLS = 2 ** 26
+ANSWER_CACHE_SIZE = 4096  # Nombre de réponses gardées par univers
+BATCH_WINDOW = 0.01  # Délai (secondes) pendant lequel les demandes sur un même univers sont regroupées
+MAX_BODY_BYTES = 1024 * 1024
+
+HTTP_STATUSES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ServiceError(Exception):
+    """
+    Erreur renvoyée au client avec un code HTTP.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Universe:
+    """
+    Univers d'actions gardé en mémoire, avec les dernières réponses calculées
+    et les demandes en attente du prochain calcul groupé.
+    """
+
+    def __init__(self, name, file, actions):
+        self.name = name
+        self.file = file
+        self.actions = actions
+        # Au-delà du coût de toutes les actions, la meilleure combinaison ne change plus
+        self.total_cost = int(actions.cost_cents.sum())
+        self.answers = {}
+        self.pending = []
+        self.batch = None
+
+    def solve_cells(self, budget):
+        """
+        :param budget: en centimes
+        :return cells: taille du calcul pour ce budget (actions x niveaux de budget)
+        """
+        budget = min(budget, self.total_cost)
+        return len(self.actions) * (budget // cost_resolution(self.actions, budget) + 1)
+
+    def remember(self, answers):
+        """
+        Garder les réponses calculées, en oubliant les plus anciennes au-delà de ANSWER_CACHE_SIZE.
+        """
+        self.answers.update(answers)
+        while len(self.answers) > ANSWER_CACHE_SIZE:
+            del self.answers[next(iter(self.answers))]
+
+
+def portfolio(actions, combination, profit, budget):
+    """
+    Réponse pour un budget.
+    :param actions:
+    :param combination: indices des actions de la meilleure combinaison
+    :param profit: en centimes
+    :param budget: en centimes
+    :return answer: dictionnaire sérialisable en JSON (montants en euros)
+    """
+    return {
+        "budget": budget / 100,
+        "profit": round(profit / 100, 2),
+        "cost": actions.selection_cost(combination) / 100,
+        "actions": [str(actions.names[index]) for index in combination],
+    }
+
+
+def solve_budgets(actions, budgets):
+    """
+    Réponses pour plusieurs budgets, calculées dans un processus de calcul :
+    seules les réponses repartent vers la boucle d'événements, jamais la matrice de décisions.
+    Une seule frontière efficiente sert tous les budgets tant que sa matrice reste sous MAX_FRONTIER_CELLS cases ;
+    au-delà, chaque budget est résolu en mémoire linéaire (Hirschberg).
+    :param actions:
+    :param budgets: en centimes
+    :return answers: dictionnaire budget -> réponse
+    """
+    total_cost = int(actions.cost_cents.sum())
+    # Au-delà du coût de toutes les actions, la meilleure combinaison ne change plus
+    levels = {budget: min(budget, total_cost) for budget in budgets}
+    max_level = max(levels.values())
+    answers = {}
+    if len(actions) * (max_level // cost_resolution(actions, max_level) + 1) <= MAX_FRONTIER_CELLS:
+        frontier = knapsack_frontier(actions, max_level)
+        for budget, level in levels.items():
+            answers[budget] = portfolio(actions, frontier.combination(level), frontier.profit(level), budget)
+    else:
+        for budget, level in levels.items():
+            combination, profit, _ = knapsack_best_combination(actions, level, backend="hirschberg")
+            answers[budget] = portfolio(actions, combination, profit, budget)
+    return answers
+
+
+class OptimizationService:
+    """
+    Service d'optimisation : les univers nettoyés restent en mémoire entre les demandes.
+    Les demandes simultanées sur un même univers sont regroupées : une seule frontière efficiente,
+    jusqu'au plus grand budget demandé, quand elle est petite (voir solve_budgets), sinon un calcul en mémoire
+    linéaire par budget, répartis sur le pool. Les réponses sont gardées pour servir immédiatement
+    les budgets déjà demandés. Les budgets dont le calcul dépasserait MAX_SOLVE_CELLS cases sont refusés.
+    Les chargements et les calculs tournent dans un pool de processus pour ne pas bloquer la boucle d'événements.
+    """
+
+    def __init__(self, executor, batch_window=BATCH_WINDOW):
+        self.executor = executor
+        self.batch_window = batch_window
+        self.universes = {}
+
+    async def load(self, name, file):
+        """
+        Charger (ou recharger) un univers.
+        :param name:
+        :param file:
+        :return description:
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            actions = await loop.run_in_executor(self.executor, load_actions, file, MAX_BUDGET)
+        except (OSError, ValueError) as error:
+            raise ServiceError(400, f"Impossible de charger {file} : {error}")
+        self.universes[name] = Universe(name, file, actions)
+        return self.describe(self.universes[name])
+
+    @staticmethod
+    def describe(universe):
+        return {
+            "name": universe.name,
+            "file": universe.file,
+            "actions": len(universe.actions),
+            "cached_answers": len(universe.answers),
+        }
+
+    async def solve(self, name, budget):
+        """
+        Meilleure combinaison d'un univers pour un budget.
+        :param name:
+        :param budget: en centimes
+        :return answer:
+        """
+        universe = self.universes.get(name)
+        if universe is None:
+            raise ServiceError(404, f"Univers inconnu : {name}")
+        if not 0 < budget <= MAX_BUDGET:
+            raise ServiceError(400, f"Le budget doit être compris entre 0 et {MAX_BUDGET / 100} €")
+
+        if budget in universe.answers:
+            return universe.answers[budget]
+        if universe.solve_cells(budget) > MAX_SOLVE_CELLS:
+            raise ServiceError(400, f"Budget trop grand pour l'univers {name} "
+                                    f"({len(universe.actions)} actions, calcul limité à {MAX_SOLVE_CELLS} cases)")
+
+        future = asyncio.get_running_loop().create_future()
+        universe.pending.append((budget, future))
+        if universe.batch is None:
+            universe.batch = asyncio.create_task(self.run_batch(universe))
+        return await future
+
+    async def run_batch(self, universe):
+        """
+        Calculer en une fois les réponses de toutes les demandes arrivées pendant batch_window.
+        """
+        await asyncio.sleep(self.batch_window)
+        pending, universe.pending, universe.batch = universe.pending, [], None
+        actions = universe.actions
+        budgets = sorted({budget for budget, _ in pending})
+
+        # Une seule frontière si elle est petite, sinon un calcul par budget, en parallèle sur le pool
+        loop = asyncio.get_running_loop()
+        if universe.solve_cells(budgets[-1]) <= MAX_FRONTIER_CELLS:
+            groups = [budgets]
+        else:
+            groups = [[budget] for budget in budgets]
+        try:
+            results = await asyncio.gather(*(loop.run_in_executor(self.executor, solve_budgets, actions, group)
+                                              for group in groups))
+        except Exception as error:
+            for _, future in pending:
+                if not future.cancelled():
+                    future.set_exception(ServiceError(500, f"Échec du calcul : {error}"))
+            return
+
+        answers = {}
+        for result in results:
+            answers.update(result)
+        universe.remember(answers)
+        for budget, future in pending:
+            if not future.cancelled():
+                future.set_result(answers[budget])
+
+    async def route(self, method, path, body):
+        """
+        :param method:
+        :param path:
+        :param body: contenu JSON décodé (None si absent)
+        :return status, response:
+        """
+        if path == "/health":
+            return {"status": "ok"}
+        if path == "/universes":
+            if method == "GET":
+                return [self.describe(universe) for universe in self.universes.values()]
+            if method == "POST":
+                return await self.load(required(body, "name"), required(body, "file"))
+            raise ServiceError(405, "Méthodes acceptées : GET, POST")
+        if path == "/solve":
+            if method != "POST":
+                raise ServiceError(405, "Méthode acceptée : POST")
+            budget = parse_cents(str(required(body, "budget")))
+            if budget is None:
+                raise ServiceError(400, "Budget invalide")
+            return await self.solve(required(body, "universe"), budget)
+        raise ServiceError(404, f"Chemin inconnu : {path}")
+
+    async def handle_connection(self, reader, writer):
+        """
+        Traiter une requête HTTP/1.1 (une requête par connexion).
+        """
+        try:
+            status, response = 200, None
+            try:
+                method, path, body = await read_request(reader)
+                response = await self.route(method, path, body)
+            except ServiceError as error:
+                status, response = error.status, {"error": str(error)}
+            except Exception as error:
+                status, response = 500, {"error": f"Erreur interne : {error}"}
+
+            content = json.dumps(response, ensure_ascii=False).encode('utf-8')
+            writer.write(f"HTTP/1.1 {status} {HTTP_STATUSES[status]}\r\n"
+                         f"Content-Type: application/json; charset=utf-8\r\n"
+                         f"Content-Length: {len(content)}\r\n"
+                         f"Connection: close\r\n\r\n".encode('ascii') + content)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def required(body, field):
+    """
+    Valeur obligatoire du corps JSON de la requête.
+    """
+    if not isinstance(body, dict) or field not in body:
+        raise ServiceError(400, f"Champ manquant : {field}")
+    return body[field]
+
+
+async def read_request(reader):
+    """
+    Lire la ligne de requête, les en-têtes et le corps JSON.
+    :return method, path, body:
+    """
+    request_line = (await reader.readline()).decode('latin-1').split()
+    if len(request_line) != 3:
+        raise ServiceError(400, "Requête HTTP invalide")
+    method, target, _ = request_line
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ServiceError(400, "En-tête Content-Length invalide")
+    if length > MAX_BODY_BYTES:
+        raise ServiceError(413, "Corps de requête trop volumineux")
+    body = None
+    if length:
+        try:
+            body = json.loads(await reader.readexactly(length))
+        except (asyncio.IncompleteReadError, ValueError):
+            raise ServiceError(400, "Corps JSON invalide")
+    return method.upper(), urlsplit(target).path, body
+
+
+async def serve(files, host=HOST, port=PORT, max_workers=None):
+    """
+    Charger les univers puis répondre aux requêtes jusqu'à l'arrêt du processus.
+    :param files: fichiers CSV chargés au démarrage (nom de l'univers : nom du fichier sans extension)
+    :param host:
+    :param port:
+    :param max_workers: nombre de processus de calcul
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        service = OptimizationService(executor)
+        for file in files:
+            universe = await service.load(Path(file).stem, file)
+            print(f"Univers chargé : {universe['name']} ({universe['actions']} actions)")
+
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        print(f"Service à l'écoute sur http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Service HTTP local de sélection d'actions.")
+    parser.add_argument("files", nargs="*", default=CSV_FILES, help="fichiers CSV chargés au démarrage")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus de calcul")
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(serve(arguments.files, arguments.host, arguments.port, arguments.workers))
+    except KeyboardInterrupt:
+        pass
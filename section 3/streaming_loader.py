@@ -0,0 +1,144 @@
+import argparse
+import csv
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from binary_universe import UNIVERSE_SUFFIX, write_universe
+from instrumentation import instrumentation
+from optimized import BUDGET, ActionSet, parse_cents, parse_lots, parse_rate, read_header
+
+
+CHUNK_ROWS = 100000  # Nombre de lignes lues et filtrées à la fois
+
+
+def read_chunks(file, budget=BUDGET, chunk_rows=CHUNK_ROWS):
+    """
+    Lire un fichier CSV par blocs de chunk_rows lignes et appliquer les filtres de load_actions à chaque bloc
+    (valeurs manquantes, coûts nuls, négatifs ou hors budget, bénéfices négatifs).
+    :param file:
+    :param budget:
+    :param chunk_rows:
+    :return chunks: générateur de (noms, coûts en centimes, bénéfices, lots ou None, numéros des lignes)
+    """
+    with open(file, newline='', encoding='utf-8') as csv_file:
+        reader = csv.reader(csv_file)
+        header, name_index, cost_index, profit_index, lots_index = read_header(reader, file)
+
+        first_row = 0
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                break
+            names, costs, rates, lots, positions = [], [], [], [], []
+            for position, row in enumerate(rows, start=first_row):
+                if len(row) < len(header):
+                    continue
+                cost = parse_cents(row[cost_index])
+                rate = parse_rate(row[profit_index])
+                if cost is None or rate is None or not (0 < cost <= budget) or rate <= 0:
+                    continue
+                names.append(row[name_index])
+                costs.append(cost)
+                rates.append(rate)
+                positions.append(position)
+                if lots_index is not None:
+                    row_lots = parse_lots(row[lots_index])
+                    lots.append(-1 if row_lots is None else row_lots)
+            first_row += len(rows)
+            yield (names, np.array(costs, dtype=np.int64), np.array(rates, dtype=np.float64),
+                   np.array(lots, dtype=np.int64) if lots_index is not None else None,
+                   np.array(positions, dtype=np.int64))
+
+
+def name_hashes(names):
+    """
+    Empreintes des noms sur 64 bits (stables pendant toute la durée du processus).
+    """
+    return np.fromiter((hash(name) for name in names), dtype=np.int64, count=len(names))
+
+
+def stream_actions(file, budget=BUDGET, chunk_rows=CHUNK_ROWS):
+    """
+    Charger un univers plus grand que la mémoire, par blocs, avec les mêmes règles que load_actions.
+    Première lecture : empreintes des noms des lignes valides, pour repérer les empreintes présentes
+    plusieurs fois. Seconde lecture : les lignes valides dont l'empreinte est unique sont gardées ;
+    les rares lignes dont l'empreinte se répète sont comparées sur leur nom exact (deux noms différents
+    peuvent avoir la même empreinte), et toutes les occurrences d'un nom en double sont supprimées.
+    La mémoire est bornée par un bloc, les empreintes des lignes valides et les actions gardées.
+    :param file:
+    :param budget:
+    :param chunk_rows:
+    :return actions: ActionSet
+    """
+    with instrumentation.phase("load", file=file) as phase:
+        hashes = [name_hashes(names) for names, _, _, _, _ in read_chunks(file, budget, chunk_rows)]
+        hashes = np.concatenate(hashes) if hashes else np.zeros(0, dtype=np.int64)
+        unique_hashes, counts = np.unique(hashes, return_counts=True)
+        repeated_hashes = unique_hashes[counts > 1]
+        phase.count(len(hashes))
+        del hashes, unique_hashes, counts
+
+    with instrumentation.phase("clean", file=file) as phase:
+        kept_names, kept_costs, kept_rates, kept_lots, kept_positions = [], [], [], [], []
+        # Lignes dont l'empreinte se répète : (nom, coût, bénéfice, lots, numéro de ligne)
+        suspects = []
+        for names, costs, rates, lots, positions in read_chunks(file, budget, chunk_rows):
+            phase.count(len(names))
+            repeated = np.isin(name_hashes(names), repeated_hashes)
+            unique = np.flatnonzero(~repeated)
+            kept_names.extend(names[index] for index in unique)
+            kept_costs.append(costs[unique])
+            kept_rates.append(rates[unique])
+            kept_positions.append(positions[unique])
+            if lots is not None:
+                kept_lots.append(lots[unique])
+            for index in np.flatnonzero(repeated).tolist():
+                suspects.append((names[index], costs[index], rates[index],
+                                 lots[index] if lots is not None else -1, positions[index]))
+
+        # Comparaison exacte des noms des lignes suspectes
+        name_counts = {}
+        for name, _, _, _, _ in suspects:
+            name_counts[name] = name_counts.get(name, 0) + 1
+        survivors = [suspect for suspect in suspects if name_counts[suspect[0]] == 1]
+
+    costs = np.concatenate(kept_costs + [np.array([survivor[1] for survivor in survivors], dtype=np.int64)])
+    rates = np.concatenate(kept_rates + [np.array([survivor[2] for survivor in survivors], dtype=np.float64)])
+    positions = np.concatenate(kept_positions + [np.array([survivor[4] for survivor in survivors], dtype=np.int64)])
+    names = kept_names + [survivor[0] for survivor in survivors]
+    lots = None
+    if kept_lots:
+        lots = np.concatenate(kept_lots + [np.array([survivor[3] for survivor in survivors], dtype=np.int64)])
+
+    if survivors:
+        # Remettre les survivants à leur place dans l'ordre du fichier
+        order = np.argsort(positions, kind='stable')
+        names = [names[index] for index in order]
+        costs, rates = costs[order], rates[order]
+        lots = lots[order] if lots is not None else None
+    return ActionSet(names, costs, rates, lots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chargement par blocs des univers volumineux.")
+    parser.add_argument("files", nargs="+", help="fichiers CSV à charger")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="écarter les actions plus chères que ce budget (en euros, par défaut aucune limite)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--output", default=None,
+                        help="écrire chaque univers au format binaire dans ce dossier (voir binary_universe.py)")
+    arguments = parser.parse_args()
+
+    budget = round(arguments.budget * 100) if arguments.budget is not None else np.iinfo(np.int64).max
+    for file in arguments.files:
+        start_time = perf_counter()
+        actions = stream_actions(file, budget, arguments.chunk_rows)
+        print(f"{file} : {len(actions)} actions ({perf_counter() - start_time:.4f} s)")
+        if arguments.output:
+            output = Path(arguments.output)
+            output.mkdir(parents=True, exist_ok=True)
+            write_universe(output / (Path(file).stem + UNIVERSE_SUFFIX), actions.names, actions.cost_cents,
+                           actions.profit, actions.max_lots, budget if arguments.budget is not None else -1)